@@ -0,0 +1,336 @@
+import cv2  # type: ignore
+import numpy as np
+import pytest
+
+from vizdet import (
+    BBoxes,
+    Font,
+    InfoBox,
+    Label,
+    PixelFormat,
+    RenderQuality,
+    UndoToken,
+)
+from vizdet.drawing import (
+    _text_coverage_cached,
+    _text_size_cached,
+    convert_color,
+    get_text_size,
+    put_text,
+    rectangle,
+)
+
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+BALANCED = RenderQuality.BALANCED
+
+
+def _i420_to_nv12(img):
+    height = img.shape[0] * 2 // 3
+    u, v = img[height:].reshape(2, -1)
+    return np.concatenate((img[:height].ravel(), np.stack((u, v), 1).ravel())).reshape(
+        img.shape
+    )
+
+
+######################
+# Normal functioning #
+######################
+
+
+def test_convert_color():
+    assert convert_color(RED, PixelFormat.BGR) == ((0, 0, 255),)
+    assert convert_color(RED, PixelFormat.RGBA) == ((255, 0, 0, 255),)
+    assert convert_color(RED, PixelFormat.GRAY) == ((76,),)
+    assert convert_color(BLUE, PixelFormat.I420) == ((41,), (240,), (110,))
+    assert convert_color(BLUE, PixelFormat.NV12) == ((41,), (240, 110))
+
+
+@pytest.mark.parametrize("height", [40, 30])
+@pytest.mark.parametrize("pixel_format", [PixelFormat.I420, PixelFormat.NV12])
+def test_rectangle_yuv(pixel_format, height):
+    """Drawing on YUV is the same as drawing on BGR and converting to YUV."""
+    bgr = np.full((height, 60, 3), 100, dtype=np.uint8)
+    yuv = cv2.cvtColor(bgr, cv2.COLOR_BGR2YUV_I420)
+    rectangle(bgr, PixelFormat.BGR, (10, 10), (29, 19), BLUE, -1)
+    expected = cv2.cvtColor(bgr, cv2.COLOR_BGR2YUV_I420)
+
+    if pixel_format == PixelFormat.NV12:
+        yuv, expected = _i420_to_nv12(yuv), _i420_to_nv12(expected)
+
+    rectangle(yuv, pixel_format, (10, 10), (29, 19), BLUE, -1)
+    np.testing.assert_array_equal(yuv, expected)
+
+
+def test_rectangle_rgb():
+    img = np.zeros((20, 20, 3), dtype=np.uint8)
+    rectangle(img, PixelFormat.RGB, (0, 0), (5, 5), RED, -1)
+
+    np.testing.assert_array_equal(img[2, 2], RED)
+
+
+@pytest.mark.parametrize(
+    "pixel_format, shape",
+    [
+        (PixelFormat.GRAY, (60, 100)),
+        (PixelFormat.RGBA, (60, 100, 4)),
+        (PixelFormat.I420, (90, 100)),
+        (PixelFormat.NV12, (90, 100)),
+    ],
+)
+def test_put_text_blended(pixel_format, shape):
+    """Text on formats FreeType can not draw on is blended into the planes."""
+    img = np.zeros(shape, dtype=np.uint8)
+    put_text(img, pixel_format, Font.get_default(), "Text", (10, 40), 20, RED, True)
+
+    assert img[:60].any()
+    assert img[:60].max() <= 255
+    if pixel_format in (PixelFormat.I420, PixelFormat.NV12):
+        assert (img[60:] != 0).any()
+
+
+def test_bboxes_rgb():
+    """Drawing on RGB is the same as drawing on BGR with swapped channels."""
+    img_bgr = np.zeros((100, 100, 3), dtype=np.uint8)
+    img_rgb = np.zeros((100, 100, 3), dtype=np.uint8)
+
+    BBoxes().draw(img_bgr, [[10, 30, 80, 90]], labels=["car"])
+    BBoxes(pixel_format=PixelFormat.RGB).draw(
+        img_rgb, [[10, 30, 80, 90]], labels=["car"]
+    )
+
+    np.testing.assert_array_equal(img_rgb, img_bgr[..., ::-1])
+
+
+@pytest.mark.parametrize(
+    "pixel_format, shape",
+    [
+        (PixelFormat.GRAY, (100, 100)),
+        (PixelFormat.BGRA, (100, 100, 4)),
+        (PixelFormat.NV12, (150, 100)),
+    ],
+)
+def test_drawers_formats(pixel_format, shape):
+    img = np.zeros(shape, dtype=np.uint8)
+
+    BBoxes(pixel_format=pixel_format).draw(img, [[10, 30, 80, 90]], labels=["car"])
+    Label(pixel_format=pixel_format).draw(img, (50, 50), "Car")
+    InfoBox(width=40, pixel_format=pixel_format).draw(img, (0, 0), ["1 car"], "Cars")
+
+    assert img.any()
+
+
+##########
+# Errors #
+##########
+
+
+def test_invalid_yuv_shape():
+    with pytest.raises(ValueError, match="not a valid NV12 image"):
+        rectangle(np.zeros((100, 100, 3)), PixelFormat.NV12, (0, 0), (5, 5), RED, 1)
+
+    # Odd width
+    with pytest.raises(ValueError, match="not a valid I420 image"):
+        rectangle(np.zeros((90, 101)), PixelFormat.I420, (0, 0), (5, 5), RED, 1)
+
+
+def test_yuv_not_contiguous():
+    """A crop of a larger I420 image can not be drawn on without copying planes."""
+    img = np.zeros((90, 200), dtype=np.uint8)[:, :100]
+
+    with pytest.raises(ValueError, match="not contiguous"):
+        rectangle(img, PixelFormat.I420, (0, 0), (5, 5), RED, -1)
+
+
+##################
+# Render quality #
+##################
+
+
+def test_text_size_fast():
+    font = Font.get_default()
+    size = get_text_size(font, "Text!", 20, RenderQuality.FAST)
+    scale = cv2.getFontScaleFromHeight(cv2.FONT_HERSHEY_SIMPLEX, 20, 1)
+
+    assert size == cv2.getTextSize("Text!", cv2.FONT_HERSHEY_SIMPLEX, scale, 1)
+
+
+@pytest.mark.parametrize(
+    "pixel_format, shape",
+    [
+        (PixelFormat.BGR, (60, 100, 3)),
+        (PixelFormat.GRAY, (60, 100)),
+        (PixelFormat.NV12, (90, 100)),
+        (PixelFormat.I420, (90, 100)),
+    ],
+)
+def test_put_text_fast(pixel_format, shape):
+    img = np.zeros(shape, dtype=np.uint8)
+    put_text(
+        img,
+        pixel_format,
+        Font.get_default(),
+        "Text",
+        (10, 40),
+        20,
+        BLUE,
+        True,
+        RenderQuality.FAST,
+    )
+
+    assert img[:60].any()
+    if pixel_format in (PixelFormat.I420, PixelFormat.NV12):
+        assert (img[60:] != 0).any()
+
+
+def test_put_text_balanced_cached():
+    font = Font.get_default()
+    img1 = np.zeros((60, 100, 3), dtype=np.uint8)
+    img2 = np.zeros((60, 100, 3), dtype=np.uint8)
+
+    put_text(img1, PixelFormat.BGR, font, "Cached", (10, 40), 20, RED, True, BALANCED)
+    hits = _text_coverage_cached.cache_info().hits
+    put_text(img2, PixelFormat.BGR, font, "Cached", (12, 42), 20, RED, True, BALANCED)
+
+    assert _text_coverage_cached.cache_info().hits == hits + 1
+    np.testing.assert_array_equal(img1[:-2, :-2], img2[2:, 2:])
+
+
+def test_drawers_balanced_cached():
+    """Drawing a cached label does not render or measure the text again."""
+    bboxes = BBoxes(quality=BALANCED)
+    label = Label(quality=BALANCED)
+
+    def draw():
+        img = np.zeros((100, 100, 3), dtype=np.uint8)
+        bboxes.draw(img, [[10, 30, 80, 90]], labels=["truck"])
+        label.draw(img, (50, 50), "Truck")
+
+    draw()
+    size_misses = _text_size_cached.cache_info().misses
+    coverage_misses = _text_coverage_cached.cache_info().misses
+    draw()
+
+    assert _text_size_cached.cache_info().misses == size_misses
+    assert _text_coverage_cached.cache_info().misses == coverage_misses
+
+
+def test_put_text_balanced_clipped():
+    """Text partially outside the image is clipped."""
+    img = np.zeros((30, 30), dtype=np.uint8)
+    put_text(
+        img,
+        PixelFormat.GRAY,
+        Font.get_default(),
+        "Text",
+        (-5, 5),
+        20,
+        RED,
+        True,
+        BALANCED,
+    )
+
+    assert img.any()
+
+
+@pytest.mark.parametrize("quality", list(RenderQuality))
+def test_drawers_quality(quality):
+    img = np.zeros((100, 100, 3), dtype=np.uint8)
+
+    BBoxes(quality=quality).draw(img, [[10, 30, 80, 90]], labels=["car"])
+    Label(quality=quality).draw(img, (50, 50), "Car")
+    InfoBox(width=40, quality=quality).draw(img, (0, 0), ["1 car"], "Cars")
+
+    assert img.any()
+
+
+########
+# Undo #
+########
+
+
+def _noise(shape):
+    return np.random.default_rng(0).integers(0, 256, shape, dtype=np.uint8)
+
+
+@pytest.mark.parametrize("quality", list(RenderQuality))
+@pytest.mark.parametrize(
+    "pixel_format, shape",
+    [
+        (PixelFormat.BGR, (200, 200, 3)),
+        (PixelFormat.GRAY, (200, 200)),
+        (PixelFormat.NV12, (300, 200)),
+        (PixelFormat.I420, (300, 200)),
+    ],
+)
+def test_undo_restores(pixel_format, shape, quality):
+    img = _noise(shape)
+    orig = img.copy()
+
+    bboxes = BBoxes(pixel_format=pixel_format, quality=quality, box_thickness=3)
+    undo = bboxes.draw(
+        img,
+        [[10, 40, 120, 150], [60, 30, 190, 199], [-20, -20, 30, 30]],
+        labels=["car", "person", "dog"],
+        return_undo=True,
+    )
+    assert not np.array_equal(img, orig)
+
+    undo.restore(img)
+    np.testing.assert_array_equal(img, orig)
+
+
+def test_undo_only_annotated_area():
+    img = _noise((500, 500, 3))
+    undo = BBoxes(box_thickness=2).draw(
+        img, [[100, 100, 400, 400]], show_labels=False, return_undo=True
+    )
+
+    # Only the outline is saved, not the inside of the box
+    assert undo.nbytes < 4 * 301 * 5 * 3
+    assert undo._buffer.size == undo.nbytes
+
+    # The text of the label is not saved on top of its filled background
+    bboxes = BBoxes(box_thickness=2, quality=RenderQuality.FAST)
+    label_undo = bboxes.draw(
+        _noise((500, 500, 3)), [[100, 100, 400, 400]], labels=["car"], return_undo=True
+    )
+    _, (x0, y0), (x1, y1) = bboxes._get_text_bbox_params("car", (100, 100), 15)
+    assert label_undo.nbytes == undo.nbytes + (x1 - x0 + 1) * (y1 - y0 + 1) * 3
+
+
+def test_undo_overlapping_drawers():
+    img = _noise((100, 100, 3))
+    orig = img.copy()
+
+    label_undo = Label().draw(img, (50, 50), "Car", return_undo=True)
+    infobox_undo = InfoBox(width=60).draw(
+        img, (20, 20), ["1 car"], "Cars", return_undo=True
+    )
+
+    infobox_undo.restore(img)
+    label_undo.restore(img)
+    np.testing.assert_array_equal(img, orig)
+
+
+def test_undo_not_requested():
+    img = np.zeros((50, 50, 3), dtype=np.uint8)
+    assert BBoxes().draw(img, [[10, 10, 40, 40]]) is None
+
+
+def test_undo_empty():
+    img = _noise((50, 50, 3))
+    orig = img.copy()
+
+    undo = BBoxes().draw(img, [], return_undo=True)
+    assert isinstance(undo, UndoToken)
+    assert undo.nbytes == 0
+
+    undo.restore(img)
+    np.testing.assert_array_equal(img, orig)
+
+
+def test_undo_wrong_image():
+    undo = Label().draw(_noise((50, 50, 3)), (25, 25), "Car", return_undo=True)
+    with pytest.raises(ValueError, match="not the one the undo token"):
+        undo.restore(np.zeros((60, 60, 3), dtype=np.uint8))
@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+from vizdet import BoxInterpolator, InterpolationMode
+
+
+def _interpolator(mode=InterpolationMode.LINEAR, **kwargs):
+    interp = BoxInterpolator(mode=mode, **kwargs)
+    # Track 1 moves right, track 2 disappears, track 3 appears
+    interp.add_keyframe(0, [[0, 0, 10, 10], [50, 50, 60, 60]], ids=[1, 2])
+    interp.add_keyframe(10, [[100, 0, 120, 10], [0, 50, 10, 60]], ids=[3, 1])
+    return interp
+
+
+######################
+# Normal functioning #
+######################
+
+
+def test_linear():
+    interp = _interpolator()
+
+    result = interp.interpolate(5)
+    assert result.frame == 5
+    np.testing.assert_array_equal(result.ids, [1])
+    np.testing.assert_array_equal(result.bboxes, [[0, 25, 10, 35]])
+    assert result.scores is None
+
+
+def test_linear_keyframe():
+    interp = _interpolator()
+
+    np.testing.assert_array_equal(interp.interpolate(0).ids, [1, 2])
+    result = interp.interpolate(10)
+    np.testing.assert_array_equal(result.ids, [1, 3])
+    np.testing.assert_array_equal(result.bboxes, [[0, 50, 10, 60], [100, 0, 120, 10]])
+
+
+def test_linear_after_last():
+    interp = _interpolator()
+    np.testing.assert_array_equal(
+        interp.interpolate(15).bboxes, interp.interpolate(10).bboxes
+    )
+
+
+def test_before_first():
+    result = _interpolator().interpolate(-1)
+    assert result.bboxes.shape == (0, 4)
+    assert result.ids.shape == (0,)
+
+
+def test_constant_velocity():
+    interp = _interpolator(InterpolationMode.CONSTANT_VELOCITY)
+
+    # Between keyframes only the past is used, so track 2 is kept in place
+    result = interp.interpolate(5)
+    np.testing.assert_array_equal(result.ids, [1, 2])
+    np.testing.assert_array_equal(result.bboxes[1], [50, 50, 60, 60])
+
+    # Track 1 keeps moving, track 3 has no velocity yet
+    result = interp.interpolate(15)
+    np.testing.assert_array_equal(result.ids, [1, 3])
+    np.testing.assert_array_equal(result.bboxes, [[0, 75, 10, 85], [100, 0, 120, 10]])
+
+
+def test_scores():
+    interp = BoxInterpolator()
+    interp.add_keyframe(
+        0, [[0, 0, 10, 10], [0, 0, 5, 5]], ids=[2, 1], scores=[0.2, 0.1]
+    )
+    interp.add_keyframe(2, [[0, 0, 10, 10]], ids=[2], scores=[0.9])
+
+    result = interp.interpolate(1)
+    np.testing.assert_array_equal(result.ids, [2])
+    np.testing.assert_array_equal(result.scores, [0.2])
+
+
+def test_unordered_keyframes():
+    interp = BoxInterpolator()
+    interp.add_keyframe(10, [[10, 0, 20, 10]], ids=[1])
+    interp.add_keyframe(0, [[0, 0, 10, 10]], ids=[1])
+
+    assert interp.keyframes == [0, 10]
+    np.testing.assert_array_equal(interp.interpolate(5).bboxes, [[5, 0, 15, 10]])
+
+
+def test_max_keyframes():
+    interp = BoxInterpolator(max_keyframes=2)
+    for frame in range(0, 40, 10):
+        interp.add_keyframe(frame, [[frame, 0, frame + 10, 10]], ids=[1])
+
+    assert interp.keyframes == [20, 30]
+    assert len(interp.interpolate(5).ids) == 0
+
+
+def test_empty_keyframe():
+    interp = BoxInterpolator()
+    interp.add_keyframe(0, np.zeros((0, 4)), ids=[])
+    interp.add_keyframe(4, [[0, 0, 10, 10]], ids=[1])
+
+    assert len(interp.interpolate(2).ids) == 0
+
+
+##########
+# Errors #
+##########
+
+
+def test_invalid_length():
+    interp = BoxInterpolator()
+
+    with pytest.raises(ValueError, match="The `ids`"):
+        interp.add_keyframe(0, [[0, 0, 10, 10]], ids=[1, 2])
+
+    with pytest.raises(ValueError, match="The `scores`"):
+        interp.add_keyframe(0, [[0, 0, 10, 10]], ids=[1], scores=[0.1, 0.2])
+
+
+def test_duplicate_ids():
+    with pytest.raises(ValueError, match="should be unique"):
+        BoxInterpolator().add_keyframe(0, [[0, 0, 1, 1], [0, 0, 2, 2]], ids=[1, 1])
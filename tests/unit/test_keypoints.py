@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from vizdet import BBoxes, ColorMode, Keypoints
+
+RED, GREEN = (255, 0, 0), (0, 255, 0)
+
+# Two objects with 3 keypoints each
+KEYPOINTS = np.array(
+    [
+        [[10, 10, 0.9], [10, 30, 0.9], [30, 30, 0.1]],
+        [[50, 10, 0.9], [50, 30, 0.9], [70, 30, 0.9]],
+    ]
+)
+SKELETON = ((0, 1), (1, 2))
+
+
+def _image():
+    return np.zeros((50, 100, 3), dtype=np.uint8)
+
+
+######################
+# Normal functioning #
+######################
+
+
+def test_draw():
+    image = _image()
+    kpts = Keypoints(skeleton=SKELETON, bbox_color_list=(RED, GREEN))
+    kpts.draw(image, KEYPOINTS, labels=[0, 1])
+
+    # Limbs
+    np.testing.assert_array_equal(image[20, 10], (0, 0, 255))
+    np.testing.assert_array_equal(image[30, 60], (0, 255, 0))
+
+    # Low-confidence keypoint and its limb are not drawn
+    assert image[30, 20:35].sum() == 0
+
+    # Keypoints are drawn as circles
+    np.testing.assert_array_equal(image[10, 12], (0, 0, 255))
+    np.testing.assert_array_equal(image[30, 72], (0, 255, 0))
+
+
+def test_ids():
+    image = _image()
+    kpts = Keypoints(
+        skeleton=SKELETON, bbox_color_list=(RED, GREEN), color_mode=ColorMode.IDS
+    )
+    kpts.draw(image, KEYPOINTS, ids=[1, 1])
+
+    np.testing.assert_array_equal(image[20, 10], (0, 255, 0))
+    np.testing.assert_array_equal(image[20, 50], (0, 255, 0))
+
+
+def test_no_scores():
+    image = _image()
+    kpts = Keypoints(skeleton=SKELETON, bbox_color_list=(RED,))
+    kpts.draw(image, KEYPOINTS[..., :2])
+
+    np.testing.assert_array_equal(image[30, 20], (0, 0, 255))
+
+
+def test_string_labels_same_color():
+    """Objects with the same string label get the same color."""
+    image = _image()
+    kpts = Keypoints(skeleton=SKELETON)
+    kpts.draw(image, KEYPOINTS, labels=["person", "person"])
+
+    np.testing.assert_array_equal(image[20, 10], image[20, 50])
+
+
+def test_same_colors_as_bboxes():
+    """Mixed labels get the same colors as their bounding boxes."""
+    labels = np.array([None, 1], dtype=object)
+    image, bboxes_image = _image(), _image()
+
+    Keypoints(skeleton=SKELETON).draw(image, KEYPOINTS, labels=labels)
+    BBoxes().draw(
+        bboxes_image,
+        [[5, 5, 15, 35], [45, 5, 55, 35]],
+        labels=labels,
+        show_labels=False,
+    )
+
+    np.testing.assert_array_equal(image[20, 10], bboxes_image[20, 5])
+    np.testing.assert_array_equal(image[20, 50], bboxes_image[20, 45])
+
+
+def test_empty():
+    image = _image()
+    Keypoints().draw(image, np.zeros((0, 17, 3)))
+
+    assert image.sum() == 0
+
+
+##########
+# Errors #
+##########
+
+
+def test_labels_list_no_int():
+    kpts = Keypoints(skeleton=SKELETON, labels_list=["person"])
+    with pytest.raises(TypeError, match="Label `person`"):
+        kpts.draw(_image(), KEYPOINTS, labels=["person", "person"])
+
+
+def test_labels_list_invalid_ind():
+    kpts = Keypoints(skeleton=SKELETON, labels_list=["person"])
+    with pytest.raises(IndexError, match="Label index `1`"):
+        kpts.draw(_image(), KEYPOINTS, labels=[0, 1])
+
+
+def test_invalid_length():
+    kpts = Keypoints(skeleton=SKELETON)
+
+    with pytest.raises(ValueError, match="The `ids`"):
+        kpts.draw(_image(), KEYPOINTS, ids=[0])
+
+    with pytest.raises(ValueError, match="The `labels`"):
+        kpts.draw(_image(), KEYPOINTS, labels=[0])
+
+
+def test_invalid_skeleton():
+    with pytest.raises(ValueError, match="refers to keypoint 16"):
+        Keypoints().draw(_image(), KEYPOINTS)
@@ -0,0 +1,206 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from vizdet import BBoxes, InfoBox, LiveAnnotator, LiveFrame
+from vizdet.live import _LatestFrameSlot
+
+RED, GREEN = (255, 0, 0), (0, 255, 0)
+BOXES = [[10, 30, 60, 80]]
+
+
+def _blocked_source(release):
+    """Generate one frame, then block until ``release`` is set, as a stalled camera."""
+    yield from _frames(1)
+    release.wait()
+    yield from _frames(1)
+
+
+def _frames(n, interval=0.0, taken=None):
+    """Generate frames, waiting for the previous one to be taken if ``taken`` set."""
+    for _ in range(n):
+        yield LiveFrame(np.zeros((100, 100, 3), dtype=np.uint8), BOXES, labels=["car"])
+        time.sleep(interval)
+        if taken is not None:
+            taken.wait()
+            taken.clear()
+
+
+######################
+# Normal functioning #
+######################
+
+
+def test_slot_keeps_latest():
+    slot = _LatestFrameSlot()
+    frames = [LiveFrame(np.zeros((1, 1, 3)), []) for _ in range(3)]
+    for frame in frames:
+        slot.put(frame)
+
+    assert slot.get() is frames[2]
+    assert slot.overwritten == 2
+
+    slot.close()
+    assert slot.get() is None
+
+
+def test_run_all_frames():
+    images, taken = [], threading.Event()
+
+    def _sink(img):
+        images.append(img)
+        taken.set()
+
+    annotator = LiveAnnotator(
+        bboxes=BBoxes(bbox_color_list=(RED,)), target_latency=float("inf")
+    )
+    stats = annotator.run(_frames(5, taken=taken), _sink)
+
+    assert stats.rendered == len(images) == 5
+    assert stats.dropped == stats.degraded == 0
+    assert 0 < stats.p50_latency <= stats.p99_latency
+    np.testing.assert_array_equal(images[0][55, 10], (0, 0, 255))
+
+
+def test_run_slow_sink_drops():
+    """Frames are dropped instead of building up lag when the sink is slow."""
+    annotator = LiveAnnotator(target_latency=0.05)
+    stats = annotator.run(_frames(40, interval=0.002), lambda img: time.sleep(0.02))
+
+    assert stats.dropped > 0
+    assert stats.rendered + stats.dropped == 40
+
+
+def test_run_degraded():
+    """If the full render is too slow, labels and the info box are skipped."""
+    images, taken = [], threading.Event()
+
+    def _sink(img):
+        images.append(img)
+        taken.set()
+
+    infobox = InfoBox(width=20, title_background_color=GREEN)
+    draw_infobox = infobox.draw
+
+    def _slow_draw(*args, **kwargs):
+        time.sleep(0.2)
+        draw_infobox(*args, **kwargs)
+
+    infobox.draw = _slow_draw  # type: ignore
+
+    def _source():
+        for frame in _frames(3, taken=taken):
+            frame.info = ["1 car"]
+            yield frame
+
+    annotator = LiveAnnotator(
+        bboxes=BBoxes(bbox_color_list=(RED,), box_thickness=1),
+        infobox=infobox,
+        infobox_title="Cars",
+        target_latency=0.15,
+    )
+    stats = annotator.run(_source(), _sink)
+
+    # The first frame is rendered fully, to estimate the render time
+    assert stats.rendered == 3
+    assert stats.degraded == 2
+    assert images[0][0:20, 0:20].any()
+    assert images[-1][0:20, 0:20].sum() == 0
+    np.testing.assert_array_equal(images[-1][55, 10], (0, 0, 255))
+
+
+def test_run_stale_frames_degraded():
+    """Frames older than the target are still shown, without labels."""
+    images, taken = [], threading.Event()
+
+    def _sink(img):
+        images.append(img)
+        taken.set()
+
+    def _source():
+        for frame in _frames(5, taken=taken):
+            frame.timestamp = time.perf_counter() - 0.06
+            yield frame
+
+    annotator = LiveAnnotator(target_latency=0.05)
+    stats = annotator.run(_source(), _sink)
+
+    assert stats.rendered == stats.degraded == len(images) == 5
+    assert stats.dropped == 0
+    assert stats.p50_latency > 0.05
+
+
+def test_stop():
+    annotator = LiveAnnotator(target_latency=float("inf"))
+    stats = annotator.run(_frames(100, interval=0.001), lambda img: annotator.stop())
+
+    assert stats.rendered == 1
+
+
+def test_stop_blocked_source():
+    """Stopping does not wait for a source that is blocked on reading."""
+    release, results = threading.Event(), []
+    annotator = LiveAnnotator(target_latency=float("inf"))
+
+    def _sink(img):
+        threading.Timer(0.05, annotator.stop).start()
+
+    runner = threading.Thread(
+        target=lambda: results.append(annotator.run(_blocked_source(release), _sink)),
+        daemon=True,
+    )
+    runner.start()
+    runner.join(5)
+    release.set()
+
+    assert not runner.is_alive()
+    assert results[0].rendered == 1
+
+
+##########
+# Errors #
+##########
+
+
+def test_source_error():
+    def _source():
+        yield from _frames(1)
+        raise RuntimeError("Camera disconnected")
+
+    annotator = LiveAnnotator(target_latency=float("inf"))
+    with pytest.raises(RuntimeError, match="Camera disconnected"):
+        annotator.run(_source(), lambda img: None)
+
+
+def test_sink_error_stops_source():
+    def _source():
+        while True:
+            yield from _frames(1, interval=0.001)
+
+    def _sink(img):
+        raise RuntimeError("Display closed")
+
+    n_threads = threading.active_count()
+    annotator = LiveAnnotator(target_latency=float("inf"))
+    with pytest.raises(RuntimeError, match="Display closed"):
+        annotator.run(_source(), _sink)
+
+    assert threading.active_count() == n_threads
+
+
+def test_sink_error_blocked_source():
+    """Errors are raised without waiting for a source that is blocked on reading."""
+
+    def _sink(img):
+        raise RuntimeError("Display closed")
+
+    release = threading.Event()
+    annotator = LiveAnnotator(target_latency=float("inf"))
+    start = time.perf_counter()
+    with pytest.raises(RuntimeError, match="Display closed"):
+        annotator.run(_blocked_source(release), _sink)
+
+    release.set()
+    assert time.perf_counter() - start < 1
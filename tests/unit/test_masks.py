@@ -0,0 +1,141 @@
+import numpy as np
+import pytest
+
+from vizdet import ColorMode, Masks
+
+RED, GREEN = (255, 0, 0), (0, 255, 0)
+
+
+def _image():
+    return np.zeros((20, 30, 3), dtype=np.uint8)
+
+
+######################
+# Normal functioning #
+######################
+
+
+def test_label_map():
+    image = _image()
+    label_map = np.zeros((20, 30), dtype=np.uint8)
+    label_map[2:5, 3:8] = 1
+    label_map[10:12, 20:25] = 2
+
+    masks = Masks(bbox_color_list=(RED, GREEN, RED), alpha=1)
+    masks.draw(image, label_map)
+
+    np.testing.assert_array_equal(
+        image[2:5, 3:8], np.broadcast_to((0, 255, 0), (3, 5, 3))
+    )
+    np.testing.assert_array_equal(image[10:12, 20:25, 2], 255)
+    assert image[label_map == 0].sum() == 0
+
+
+def test_label_map_no_background():
+    image = _image()
+    masks = Masks(bbox_color_list=(RED,), alpha=1, background=None)
+    masks.draw(image, np.zeros((20, 30), dtype=int))
+
+    np.testing.assert_array_equal(image[..., 2], 255)
+
+
+def test_label_map_large_and_negative_ids():
+    """Any integer values get the same colors as the same ids in `BBoxes`."""
+    image = _image()
+    label_map = np.zeros((20, 30), dtype=np.int64)
+    label_map[2:5, 3:8] = 2**31 + 1
+    label_map[10:12, 20:25] = -1
+
+    colors = (RED, RED, GREEN)
+    masks = Masks(bbox_color_list=colors, color_mode=ColorMode.IDS, alpha=1)
+    masks.draw(image, label_map)
+
+    # 2**31 + 1 = 0 (mod 3), -1 = 2 (mod 3)
+    np.testing.assert_array_equal(
+        image[2:5, 3:8], np.broadcast_to((0, 0, 255), (3, 5, 3))
+    )
+    np.testing.assert_array_equal(
+        image[10:12, 20:25], np.broadcast_to((0, 255, 0), (2, 5, 3))
+    )
+    assert image[label_map == 0].sum() == 0
+
+
+def test_label_map_empty():
+    image = _image()
+    Masks().draw(image, np.zeros((20, 30), dtype=int))
+
+    assert image.sum() == 0
+
+
+def test_instances_labels():
+    image = _image()
+    stack = np.zeros((2, 20, 30), dtype=bool)
+    stack[0, 0:10, 0:10] = True
+    stack[1, 5:15, 5:15] = True
+
+    masks = Masks(bbox_color_list=(RED, GREEN), alpha=1)
+    masks.draw(image, stack, labels=[0, 1])
+
+    # Later mask is on top
+    np.testing.assert_array_equal(image[2, 2], (0, 0, 255))
+    np.testing.assert_array_equal(image[7, 7], (0, 255, 0))
+    np.testing.assert_array_equal(image[12, 12], (0, 255, 0))
+    assert image[~stack.any(0)].sum() == 0
+
+
+def test_instances_ids():
+    image = _image()
+    stack = np.zeros((2, 20, 30), dtype=np.uint8)
+    stack[0, 0:5, 0:5] = 1
+    stack[1, 10:15, 10:15] = 1
+
+    masks = Masks(bbox_color_list=(RED, GREEN), color_mode=ColorMode.IDS, alpha=1)
+    masks.draw(image, stack, ids=[3, 4])
+
+    np.testing.assert_array_equal(image[2, 2], (0, 255, 0))
+    np.testing.assert_array_equal(image[12, 12], (0, 0, 255))
+
+
+def test_alpha():
+    image = np.full((20, 30, 3), 100, dtype=np.uint8)
+    label_map = np.zeros((20, 30), dtype=int)
+    label_map[5:10, 5:10] = 1
+
+    masks = Masks(bbox_color_list=((0, 0, 0), (200, 200, 200)), alpha=0.5)
+    masks.draw(image, label_map)
+
+    np.testing.assert_array_equal(image[5:10, 5:10], 150)
+    np.testing.assert_array_equal(image[0:5], 100)
+
+
+##########
+# Errors #
+##########
+
+
+def test_labels_list_invalid_ind():
+    masks = Masks(labels_list=["car", "truck"])
+    with pytest.raises(IndexError, match="Label index `2`"):
+        masks.draw(_image(), np.full((20, 30), 2))
+
+
+def test_labels_list_no_int():
+    masks = Masks(labels_list=["car", "truck"])
+    with pytest.raises(TypeError, match="Label `car`"):
+        masks.draw(_image(), np.ones((1, 20, 30), dtype=bool), labels=["car"])
+
+
+def test_invalid_length():
+    masks = Masks()
+    stack = np.ones((2, 20, 30), dtype=bool)
+
+    with pytest.raises(ValueError, match="The `ids`"):
+        masks.draw(_image(), stack, ids=[0])
+
+    with pytest.raises(ValueError, match="The `labels`"):
+        masks.draw(_image(), stack, labels=[0])
+
+
+def test_invalid_shape():
+    with pytest.raises(ValueError, match="same height and width"):
+        Masks().draw(_image(), np.ones((10, 10), dtype=int))
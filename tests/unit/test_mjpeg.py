@@ -0,0 +1,196 @@
+import socket
+import threading
+import time
+
+import cv2  # type: ignore
+import numpy as np
+import pytest
+
+from vizdet import MJPEGServer
+
+
+def _connect(server, method="GET"):
+    sock = socket.create_connection((server.host, server.port), timeout=5)
+    sock.sendall(f"{method} / HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    return sock
+
+
+def _wait_for(condition, timeout=5.0):
+    end = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < end, "Timed out"
+        time.sleep(0.005)
+
+
+def _read_until(sock, data, marker):
+    while marker not in data:
+        chunk = sock.recv(65536)
+        assert chunk, "Connection closed"
+        data += chunk
+    return data
+
+
+def _read_header(sock):
+    """Read the HTTP response header, return it and the remaining data."""
+    data = _read_until(sock, b"", b"\r\n\r\n")
+    return data.split(b"\r\n\r\n", 1)
+
+
+def _read_image(sock, data=b""):
+    """Read the next JPEG image from the stream, return it and the remaining data."""
+    data = _read_until(sock, data, b"\r\n\r\n")
+    headers, data = data.split(b"\r\n\r\n", 1)
+    length = int(headers.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+    while len(data) < length:
+        data += sock.recv(65536)
+
+    img = cv2.imdecode(np.frombuffer(data[:length], dtype=np.uint8), cv2.IMREAD_COLOR)
+    return img, data[length:]
+
+
+def _image(value=0):
+    img = np.full((40, 60, 3), value, dtype=np.uint8)
+    cv2.rectangle(img, (10, 10), (30, 30), (0, 0, 255), -1)
+    return img
+
+
+######################
+# Normal functioning #
+######################
+
+
+def test_stream():
+    with MJPEGServer(port=0) as server:
+        sock = _connect(server)
+        _wait_for(lambda: server.n_clients == 1)
+
+        header, data = _read_header(sock)
+        assert b"multipart/x-mixed-replace" in header
+
+        server.publish(_image())
+        img, _ = _read_image(sock, data)
+        sock.close()
+
+    assert img.shape == (40, 60, 3)
+    np.testing.assert_allclose(img[20, 20], (0, 0, 255), atol=20)
+
+
+def test_encode_once(monkeypatch):
+    calls = []
+    imencode = cv2.imencode
+
+    def _imencode(*args, **kwargs):
+        calls.append(args)
+        return imencode(*args, **kwargs)
+
+    monkeypatch.setattr(cv2, "imencode", _imencode)
+
+    with MJPEGServer(port=0, quality=50) as server:
+        # No clients, nothing is encoded
+        server.publish(_image())
+        assert not calls
+
+        socks = [_connect(server) for _ in range(3)]
+        _wait_for(lambda: server.n_clients == 3)
+
+        server.publish(_image())
+        for sock in socks:
+            _read_image(sock, _read_header(sock)[1])
+            sock.close()
+
+    assert len(calls) == 1
+    assert calls[0][2] == [cv2.IMWRITE_JPEG_QUALITY, 50]
+
+
+def test_slow_client_drops():
+    """A client that does not read does not make frames pile up."""
+    rng = np.random.default_rng(0)
+    noise = rng.integers(0, 256, (500, 500, 3), dtype=np.uint8)
+
+    with MJPEGServer(port=0, quality=100) as server:
+        sock = _connect(server)
+        _wait_for(lambda: server.n_clients == 1)
+
+        for _ in range(100):
+            server.publish(noise)
+
+        _wait_for(lambda: server.dropped > 0)
+        sock.close()
+
+
+def test_client_disconnect():
+    with MJPEGServer(port=0) as server:
+        sock = _connect(server)
+        _wait_for(lambda: server.n_clients == 1)
+        sock.close()
+
+        # The server notices the disconnect when it tries to send the next frame
+        def _disconnected():
+            server.publish(_image())
+            return server.n_clients == 0
+
+        _wait_for(_disconnected)
+
+
+def test_stop_clients_connected():
+    """Stopping does not wait for connected clients to disconnect."""
+    rng = np.random.default_rng(0)
+    noise = rng.integers(0, 256, (500, 500, 3), dtype=np.uint8)
+
+    server = MJPEGServer(port=0)
+    server.start()
+    socks = [_connect(server) for _ in range(2)]
+    _wait_for(lambda: server.n_clients == 2)
+
+    # One of the clients does not read, so its connection has pending data
+    for _ in range(20):
+        server.publish(noise)
+    _read_header(socks[0])
+
+    stopper = threading.Thread(target=server.stop)
+    stopper.start()
+    stopper.join(timeout=5)
+
+    assert not stopper.is_alive()
+    assert server.n_clients == 0
+    for sock in socks:
+        sock.close()
+
+
+def test_restart():
+    server = MJPEGServer(port=0)
+    server.start()
+    server.stop()
+    server.start()
+    server.stop()
+
+
+##########
+# Errors #
+##########
+
+
+def test_invalid_quality():
+    with pytest.raises(ValueError, match="between 0 and 100"):
+        MJPEGServer(quality=101)
+
+
+def test_publish_not_started():
+    with pytest.raises(RuntimeError, match="not running"):
+        MJPEGServer().publish(_image())
+
+
+def test_method_not_allowed():
+    with MJPEGServer(port=0) as server:
+        sock = _connect(server, method="POST")
+        header, _ = _read_header(sock)
+        sock.close()
+
+    assert header.startswith(b"HTTP/1.0 405")
+    assert server.n_clients == 0
+
+
+def test_port_in_use():
+    with MJPEGServer(port=0) as server:
+        with pytest.raises(OSError):
+            MJPEGServer(port=server.port).start()
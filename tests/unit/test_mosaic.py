@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from vizdet import BBoxes, InfoBox, Mosaic
+
+RED, GREEN = (255, 0, 0), (0, 255, 0)
+
+
+def _frame(value, width=80, height=60):
+    return np.full((height, width, 3), value, dtype=np.uint8)
+
+
+@pytest.fixture
+def mosaic():
+    with Mosaic(
+        rows=2,
+        cols=2,
+        cell_width=40,
+        cell_height=30,
+        bboxes=BBoxes(bbox_color_list=(RED,), box_thickness=1),
+        infobox=InfoBox(width=20, title_background_color=GREEN),
+    ) as mosaic:
+        yield mosaic
+
+
+######################
+# Normal functioning #
+######################
+
+
+def test_cell_view(mosaic):
+    cell = mosaic.cell(3)
+    cell[:] = 5
+
+    assert np.shares_memory(cell, mosaic.canvas)
+    np.testing.assert_array_equal(mosaic.canvas[30:, 40:], 5)
+    np.testing.assert_array_equal(mosaic.canvas[:30], 0)
+
+
+def test_draw_frames(mosaic):
+    canvas = mosaic.draw([_frame(1), _frame(2), None, _frame(4, 40, 30)])
+
+    assert canvas is mosaic.canvas
+    np.testing.assert_array_equal(canvas[:30, :40], 1)
+    np.testing.assert_array_equal(canvas[:30, 40:], 2)
+    np.testing.assert_array_equal(canvas[30:, :40], 0)
+    np.testing.assert_array_equal(canvas[30:, 40:], 4)
+
+
+def test_draw_bboxes_rescaled(mosaic):
+    mosaic.draw([None, _frame(0)], bboxes=[None, [[10, 10, 50, 40]]])
+
+    # Box scaled by 0.5 and moved to the second cell
+    np.testing.assert_array_equal(
+        mosaic.canvas[5, 45:65], np.tile((0, 0, 255), (20, 1))
+    )
+    np.testing.assert_array_equal(mosaic.canvas[10, 55], 0)
+
+
+def test_draw_header(mosaic):
+    mosaic.draw([_frame(0)], titles=["Cam"])
+
+    np.testing.assert_array_equal(mosaic.canvas[1, 1], (0, 255, 0))
+    np.testing.assert_array_equal(mosaic.canvas[1, 41], 0)
+
+
+def test_draw_settings_changed(mosaic):
+    """Changes to the drawers after the first draw are used by worker threads."""
+    mosaic.draw([_frame(0)], bboxes=[[[10, 10, 50, 40]]])
+    mosaic.bboxes.bbox_color_list = (GREEN,)
+    mosaic.draw([_frame(0)], bboxes=[[[10, 10, 50, 40]]])
+
+    np.testing.assert_array_equal(mosaic.canvas[5, 10], (0, 255, 0))
+
+
+def test_draw_serial():
+    with Mosaic(rows=1, cols=2, cell_width=40, cell_height=30, max_workers=1) as mosaic:
+        mosaic.draw([_frame(1), _frame(2)])
+
+    np.testing.assert_array_equal(mosaic.canvas[:, 40:], 2)
+
+
+##########
+# Errors #
+##########
+
+
+def test_invalid_cell(mosaic):
+    with pytest.raises(IndexError, match="Cell index `4`"):
+        mosaic.cell(4)
+
+
+def test_too_many_frames(mosaic):
+    with pytest.raises(ValueError, match="Got 5 frames"):
+        mosaic.draw([None] * 5)
+
+
+def test_invalid_length(mosaic):
+    with pytest.raises(ValueError, match="The `titles`"):
+        mosaic.draw([None, None], titles=["Cam"])
+
+
+def test_header_no_infobox():
+    with Mosaic(rows=1, cols=1, cell_width=40, cell_height=30) as mosaic:
+        with pytest.raises(ValueError, match="The `infobox`"):
+            mosaic.draw([_frame(0)], titles=["Cam"])
@@ -0,0 +1,160 @@
+import os
+
+import numpy as np
+import pytest
+
+from vizdet import MOTReader
+
+LINES = [
+    "1,1,10,20,30,40,0.9,-1,-1,-1",
+    "1,2,50.4,60.6,10,10,0.8,-1,-1,-1",
+    "2,1,12,22,30,40,0.95,-1,-1,-1",
+    "4,3,0,0,5,5,0.5,-1,-1,-1",
+    "4,1,14,24,30,40,0.7,-1,-1,-1",
+]
+
+
+@pytest.fixture
+def mot_file(tmp_path):
+    path = tmp_path / "results.txt"
+    path.write_text("\n".join(LINES) + "\n")
+    return path
+
+
+######################
+# Normal functioning #
+######################
+
+
+def test_getitem(mot_file):
+    with MOTReader(mot_file) as reader:
+        frame = reader[1]
+
+    assert frame.frame == 1
+    np.testing.assert_array_equal(frame.bboxes, [[10, 20, 40, 60], [50, 61, 60, 71]])
+    np.testing.assert_array_equal(frame.ids, [1, 2])
+    np.testing.assert_allclose(frame.scores, [0.9, 0.8])
+    assert np.issubdtype(frame.bboxes.dtype, np.integer)
+
+
+def test_missing_frame(mot_file):
+    with MOTReader(mot_file) as reader:
+        frame = reader[3]
+
+    assert frame.bboxes.shape == (0, 4)
+    assert frame.ids.shape == (0,)
+
+
+def test_frames(mot_file):
+    with MOTReader(mot_file) as reader:
+        np.testing.assert_array_equal(reader.frames, [1, 2, 4])
+        assert len(reader) == 3
+
+
+@pytest.mark.parametrize("chunk_size", [7, 40, 2**24])
+def test_iter(mot_file, chunk_size):
+    with MOTReader(mot_file, save_index=False, chunk_size=chunk_size) as reader:
+        frames = list(reader)
+
+    assert [f.frame for f in frames] == [1, 2, 4]
+    np.testing.assert_array_equal(frames[2].ids, [3, 1])
+    np.testing.assert_array_equal(frames[1].bboxes, [[12, 22, 42, 62]])
+
+
+def test_unsorted(tmp_path):
+    path = tmp_path / "results.txt"
+    path.write_text("\n".join([LINES[0], LINES[2], "", LINES[1], " \t", LINES[4]]))
+
+    with MOTReader(path, chunk_size=10) as reader:
+        np.testing.assert_array_equal(reader[1].ids, [1, 2])
+        assert [f.frame for f in reader] == [1, 2, 4]
+        assert [len(f.ids) for f in reader] == [2, 1, 1]
+
+
+def test_no_scores(tmp_path):
+    path = tmp_path / "results.txt"
+    path.write_text("1,1,10,20,30,40\n2,1,10,20,30,40\n")
+
+    with MOTReader(path) as reader:
+        frame = reader[2]
+
+    assert frame.scores is None
+    np.testing.assert_array_equal(frame.bboxes, [[10, 20, 40, 60]])
+
+
+def test_index_saved(mot_file):
+    with MOTReader(mot_file) as reader:
+        reader[1]
+
+    index_file = mot_file.with_name("results.txt.idx")
+    assert index_file.exists()
+
+    # Loaded index gives the same results
+    with MOTReader(mot_file) as reader:
+        assert reader._load_index(*_stat(mot_file))
+        np.testing.assert_array_equal(reader[4].ids, [3, 1])
+
+
+def test_index_stale(mot_file):
+    with MOTReader(mot_file) as reader:
+        reader[1]
+
+    mot_file.write_text("\n".join(LINES[2:]) + "\n")
+    os.utime(mot_file, ns=(0, 0))
+
+    with MOTReader(mot_file) as reader:
+        np.testing.assert_array_equal(reader.frames, [2, 4])
+
+
+@pytest.mark.parametrize("n_bytes", [0, 10, 100])
+def test_index_corrupted(mot_file, n_bytes):
+    """A truncated index is rebuilt."""
+    with MOTReader(mot_file) as reader:
+        reader[1]
+
+    index_file = mot_file.with_name("results.txt.idx")
+    index_file.write_bytes(index_file.read_bytes()[:n_bytes])
+
+    with MOTReader(mot_file) as reader:
+        np.testing.assert_array_equal(reader[4].ids, [3, 1])
+
+    with MOTReader(mot_file) as reader:
+        assert reader._load_index(*_stat(mot_file))
+
+
+def test_index_no_temporary_files(mot_file, tmp_path):
+    with MOTReader(mot_file) as reader:
+        reader[1]
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "results.txt",
+        "results.txt.idx",
+    ]
+
+
+def test_index_not_writable(mot_file, tmp_path):
+    """If the index can not be saved, the in-memory index is used."""
+    index_file = tmp_path / "missing_dir" / "results.idx"
+
+    with MOTReader(mot_file, index_file_name=index_file) as reader:
+        np.testing.assert_array_equal(reader[4].ids, [3, 1])
+
+    assert not index_file.exists()
+
+
+def _stat(path):
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+##########
+# Errors #
+##########
+
+
+def test_too_few_columns(tmp_path):
+    path = tmp_path / "results.txt"
+    path.write_text("1,1,10,20\n")
+
+    with pytest.raises(ValueError, match="has 4 columns"):
+        MOTReader(path)[1]
@@ -1,6 +1,14 @@
 __version__ = "0.1.8"
 
 from .bboxes import BBoxes, ColorMode  # noqa: F401
+from .drawing import PixelFormat, RenderQuality, UndoToken  # noqa: F401
 from .font import Font  # noqa: F401
 from .infobox import InfoBox  # noqa: F401
+from .interpolate import BoxInterpolator, InterpolationMode  # noqa: F401
+from .keypoints import Keypoints  # noqa: F401
 from .label import Label  # noqa: F401
+from .live import LiveAnnotator, LiveFrame, LiveStats  # noqa: F401
+from .masks import Masks  # noqa: F401
+from .mjpeg import MJPEGServer  # noqa: F401
+from .mosaic import Mosaic  # noqa: F401
+from .mot import MOTFrame, MOTReader  # noqa: F401
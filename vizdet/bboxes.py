@@ -2,9 +2,16 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Optional, Sequence, Tuple, Union
 
-import cv2  # type: ignore
 import numpy as np
 
+from .drawing import (
+    PixelFormat,
+    RenderQuality,
+    UndoToken,
+    get_text_size,
+    put_text,
+    rectangle,
+)
 from .font import Font
 
 # Default color list
@@ -30,6 +37,26 @@ class ColorMode(Enum):
     IDS = 2
 
 
+def _get_color(
+    color_list: Sequence[Tuple[int, int, int]],
+    color_mode: ColorMode,
+    label: Optional[Union[str, int]],
+    item_id: Optional[int],
+) -> Tuple[int, int, int]:
+    """Get the color from ``color_list``, based on label (hash) or item id."""
+
+    color_ind: Optional[int] = None
+    if color_mode == ColorMode.LABELS:
+        if isinstance(label, str):
+            color_ind = abs(hash(label))
+        elif isinstance(label, (int, np.integer)):
+            color_ind = label
+    elif color_mode == ColorMode.IDS:
+        color_ind = item_id
+
+    return color_list[(color_ind or 0) % len(color_list)]
+
+
 @dataclass
 class BBoxes:
     """The class for drawing bounding boxes and associated labels of detected objects.
@@ -46,6 +73,8 @@ class BBoxes:
         padding: How many pixels to pad the label background on each side.
         separator: What to separate different parts of the text label with
         font_height: Label font height.
+        pixel_format: The pixel format of images that are drawn on.
+        quality: The quality of rendering text, see :class:`RenderQuality`.
     """
 
     font: Font = field(default_factory=Font.get_default)
@@ -57,6 +86,8 @@ class BBoxes:
     padding: int = 2
     separator: str = " | "
     font_height: int = 15
+    pixel_format: PixelFormat = PixelFormat.BGR
+    quality: RenderQuality = RenderQuality.HIGH
 
     def _get_label_value(
         self, label: Optional[Union[int, str]]
@@ -122,16 +153,7 @@ class BBoxes:
     ) -> Tuple[int, int, int]:
         """Get the color of the box, based on label (hash) or item id."""
 
-        color_ind: Optional[int] = None
-        if self.color_mode == ColorMode.LABELS:
-            if isinstance(label, str):
-                color_ind = abs(hash(label))
-            elif isinstance(label, (int, np.integer)):
-                color_ind = label
-        elif self.color_mode == ColorMode.IDS:
-            color_ind = item_id
-
-        return self.bbox_color_list[(color_ind or 0) % len(self.bbox_color_list)]
+        return _get_color(self.bbox_color_list, self.color_mode, label, item_id)
 
     def _get_text_bbox_params(
         self, label: str, box_orig: Tuple[int, int], font_height: int
@@ -147,7 +169,7 @@ class BBoxes:
                 box_pt2: The second point of the text background box
         """
 
-        bsize = self.font.font.getTextSize(label, font_height, -1)
+        bsize = get_text_size(self.font, label, font_height, self.quality)
 
         text_orig = (
             box_orig[0] + self.padding,
@@ -171,7 +193,9 @@ class BBoxes:
         ids: Union[Optional[Sequence[int]], np.ndarray] = None,
         labels: Union[Optional[Sequence[Union[str, int]]], np.ndarray] = None,
         scores: Union[Optional[Sequence[float]], np.ndarray] = None,
-    ):
+        show_labels: bool = True,
+        return_undo: bool = False,
+    ) -> Optional[UndoToken]:
         """Draw the bounding boxes with their labels.
 
         The bounding boxes are drawn as specified in ``bboxes``, and
@@ -188,10 +212,14 @@ class BBoxes:
         indices, and the value displayed will be the string from ``labels_list``
         corresponding to the index.
 
-        This method edits the ``img`` in place and does not return any value.
+        This method edits the ``img`` in place. To get the original image back
+        afterwards without copying all of it, set ``return_undo``: the pixels
+        under the boxes and labels are then saved, and the returned token can
+        erase them.
 
         Args:
-            img: The image to draw bounding boxes on.
+            img: The image to draw bounding boxes on, in the ``pixel_format``
+                format.
             bboxes: Coordinates of bounding boxes in the
                 ``[xmin, ymin, xmax, ymax]`` format. Elements should be integers.
             ids: Item IDs from tracking.
@@ -199,6 +227,13 @@ class BBoxes:
                 should be intigers corresponding to indices of that list.
             scores: The confidence (probability) of the label, should
                 be a floating-point number between 0 and 1.
+            show_labels: Whether to draw the text labels. If ``False``, only the
+                bounding boxes are drawn (still colored by labels or IDs).
+            return_undo: Whether to save the pixels under the boxes and labels.
+
+        Returns:
+            If ``return_undo`` is set, an :class:`UndoToken` which restores the
+            image when its ``restore`` method is called, otherwise ``None``.
         """
 
         # Check that all lists are of proper size
@@ -217,6 +252,12 @@ class BBoxes:
                 "The `scores` should be the same lenght as the `boxes_coords`."
             )
 
+        undo = UndoToken(img, self.pixel_format) if return_undo else None
+
+        # Nothing to draw, e.g. a frame without detections
+        if len(bboxes) == 0:
+            return undo
+
         if not isinstance(bboxes[0][0], (int, np.integer)):
             raise ValueError("The `bboxes` elements should be integers.")
 
@@ -226,16 +267,20 @@ class BBoxes:
             label = labels[idx] if labels is not None else None
             score = scores[idx] if scores is not None else None
 
-            text_label = self._get_text_label(item_id, label, score)
+            text_label = None
+            if show_labels:
+                text_label = self._get_text_label(item_id, label, score)
             bbox_color = self._get_bbox_color(label, item_id)
 
             # Draw object bounding box
-            _ = cv2.rectangle(
+            rectangle(
                 img,
+                self.pixel_format,
                 pt1=(coords[0], coords[1]),
                 pt2=(coords[2], coords[3]),
-                color=bbox_color[::-1],
+                color=bbox_color,
                 thickness=self.box_thickness,
+                undo=undo,
             )
 
             # Draw label-related things
@@ -244,20 +289,29 @@ class BBoxes:
                     text_label, coords[0:2], self.font_height
                 )
 
-                cv2.rectangle(
+                rectangle(
                     img,
+                    self.pixel_format,
                     pt1=text_box_pt1,
                     pt2=text_box_pt2,
-                    color=bbox_color[::-1],
+                    color=bbox_color,
                     thickness=-1,
+                    undo=undo,
                 )
-                self.font.font.putText(
-                    img=img,
+                put_text(
+                    img,
+                    self.pixel_format,
+                    font=self.font,
                     text=text_label,
                     org=text_org,
-                    fontHeight=self.font_height,
-                    color=self.text_color[::-1],
-                    thickness=-1,
-                    line_type=cv2.LINE_AA,
-                    bottomLeftOrigin=True,
+                    font_height=self.font_height,
+                    color=self.text_color,
+                    bottom_left_origin=True,
+                    quality=self.quality,
+                    undo=undo,
                 )
+
+        if undo is not None:
+            undo.compact()
+
+        return undo
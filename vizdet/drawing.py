@@ -0,0 +1,592 @@
+from enum import Enum
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2  # type: ignore
+import numpy as np
+
+from .font import Font
+
+
+class PixelFormat(Enum):
+    """The pixel format of the image that is drawn on.
+
+    Packed formats (``BGR``, ``RGB``, ``BGRA``, ``RGBA`` and ``GRAY``) are arrays of
+    shape ``(H, W, C)`` (or ``(H, W)`` for ``GRAY``). Planar YUV 4:2:0 formats
+    (``NV12`` and ``I420``) are arrays of shape ``(H * 3 / 2, W)``, as returned by
+    decoders and by ``cv2.cvtColor``, where height and width must be even. They
+    must be contiguous, so that each plane can be accessed as a view.
+    """
+
+    BGR = 1
+    RGB = 2
+    BGRA = 3
+    RGBA = 4
+    GRAY = 5
+    NV12 = 6
+    I420 = 7
+
+
+class RenderQuality(Enum):
+    """The quality (and cost) of rendering text.
+
+    - ``FAST``: text is drawn with the (non-antialiased) Hershey font built into
+      OpenCV, instead of FreeType. Use for thumbnails and high-fps debug streams.
+    - ``BALANCED``: text is rendered with FreeType once for each distinct string,
+      font and height, and the cached result is blended into the image. Repeated
+      labels (such as class names) then only cost a blend of a small patch.
+    - ``HIGH``: text is rendered with FreeType every time it is drawn. This is
+      the default, and gives the same results as previous versions.
+
+    Rectangles are drawn in the same way (without antialiasing) in all tiers.
+
+    Approximate costs of drawing a single 15 character label with the height of
+    15 pixels (a ``put_text`` call on a 1080p image, OpenCV 5.0, one core of an
+    Intel Xeon server CPU - expect 2-3 times different numbers on other
+    machines):
+
+    - ``FAST``: about 9 µs on BGR, about 28 µs on NV12.
+    - ``BALANCED``: about 20 µs on BGR, about 60 µs on NV12, once the label is
+      cached. A cached label makes no FreeType calls at all, as its size is cached
+      too. The first draw of a label additionally costs one FreeType render.
+    - ``HIGH``: one FreeType render and size query on every draw (plus the blend
+      on formats other than BGR and RGB). This was not measured, as the cost
+      depends on the FreeType and HarfBuzz build; measure it with your build if
+      it matters.
+
+    Drawing a whole box with its label (a :meth:`BBoxes.draw` call) costs about
+    40 µs on BGR and 60 µs on NV12 with ``FAST``, and about 45 µs on BGR and
+    100 µs on NV12 with ``BALANCED``.
+    """
+
+    FAST = 1
+    BALANCED = 2
+    HIGH = 3
+
+
+# Formats where text can be drawn directly by FreeType
+_FREETYPE_FORMATS = (PixelFormat.BGR, PixelFormat.RGB)
+
+# Font used for the FAST quality
+_HERSHEY_FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+
+@lru_cache(maxsize=None)
+def convert_color(
+    color: Tuple[int, ...], pixel_format: PixelFormat
+) -> Tuple[Tuple[int, ...], ...]:
+    """Convert an RGB color into the values of each plane of the pixel format.
+
+    The conversion to YUV is the same as the one OpenCV uses (BT.601). Results
+    are cached, so each color is only converted once.
+    """
+
+    red, green, blue = (int(c) for c in color[:3])
+
+    if pixel_format == PixelFormat.BGR:
+        return ((blue, green, red),)
+    elif pixel_format == PixelFormat.RGB:
+        return ((red, green, blue),)
+    elif pixel_format == PixelFormat.BGRA:
+        return ((blue, green, red, 255),)
+    elif pixel_format == PixelFormat.RGBA:
+        return ((red, green, blue, 255),)
+
+    bgr = np.full((2, 2, 3), (blue, green, red), dtype=np.uint8)
+    if pixel_format == PixelFormat.GRAY:
+        return ((int(cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)[0, 0]),),)
+
+    yuv = cv2.cvtColor(bgr, cv2.COLOR_BGR2YUV_I420)
+    y, u, v = int(yuv[0, 0]), int(yuv[2, 0]), int(yuv[2, 1])
+    if pixel_format == PixelFormat.NV12:
+        return ((y,), (u, v))
+    else:
+        return ((y,), (u,), (v,))
+
+
+class UndoToken:
+    """A record of the pixels under drawn annotations, used to erase them.
+
+    Drawers save the pixels of each region they are about to draw on (the
+    outline of a rectangle, the area of a filled rectangle or of a text) into the
+    token, so only the annotated area is copied, instead of the whole image.
+    Once drawing is done, the saved patches are compacted into a single buffer.
+
+    Calling :meth:`restore` writes the patches back in reverse order, which
+    erases the annotations exactly, even where they overlap. For the same reason,
+    a region within the last region saved on the same plane (such as a text on
+    its filled background) is not saved again.
+    """
+
+    def __init__(self, img: np.ndarray, pixel_format: PixelFormat):
+        self.pixel_format = pixel_format
+        self.shape = img.shape
+        self._regions: List[Tuple[int, int, int, int, int]] = []
+        self._patches: List[np.ndarray] = []
+        self._buffer = np.zeros(0, dtype=img.dtype)
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._last_regions: Dict[int, Tuple[int, int, int, int]] = {}
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes of the saved pixels."""
+
+        return self._buffer.nbytes + sum(p.nbytes for p in self._patches)
+
+    def save(
+        self, plane_idx: int, plane: np.ndarray, x0: int, y0: int, x1: int, y1: int
+    ):
+        """Save the pixels of the plane in the rectangle ``[x0, x1) x [y0, y1)``."""
+
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1, plane.shape[1]), min(y1, plane.shape[0])
+        if x1 <= x0 or y1 <= y0:
+            return
+
+        last = self._last_regions.get(plane_idx)
+        if last and last[0] <= x0 and last[1] <= y0 and x1 <= last[2] and y1 <= last[3]:
+            return
+
+        self._last_regions[plane_idx] = (x0, y0, x1, y1)
+        self._regions.append((plane_idx, x0, y0, x1, y1))
+        self._patches.append(plane[slice(y0, y1), slice(x0, x1)].flatten())
+
+    def compact(self):
+        """Move the saved patches into a single buffer."""
+
+        if not self._patches:
+            return
+
+        sizes = [p.size for p in self._patches]
+        self._buffer = np.concatenate([self._buffer] + self._patches)
+        self._offsets = np.concatenate(
+            (self._offsets, self._offsets[-1] + np.cumsum(sizes))
+        )
+        self._patches = []
+
+    def restore(self, img: np.ndarray):
+        """Erase the annotations by writing the saved pixels back to the image."""
+
+        if img.shape != self.shape:
+            raise ValueError(
+                f"The image of shape {img.shape} is not the one the undo token was"
+                f" created for, which has shape {self.shape}."
+            )
+
+        self.compact()
+        planes = get_planes(img, self.pixel_format)
+        for idx in reversed(range(len(self._regions))):
+            plane_idx, x0, y0, x1, y1 = self._regions[idx]
+            roi = planes[plane_idx][0][slice(y0, y1), slice(x0, x1)]
+            start, end = self._offsets[idx], self._offsets[idx + 1]
+            roi[...] = self._buffer[start:end].reshape(roi.shape)
+
+
+def get_planes(
+    img: np.ndarray, pixel_format: PixelFormat
+) -> List[Tuple[np.ndarray, int]]:
+    """Get views of the planes of the image, with their subsampling factors."""
+
+    if pixel_format not in (PixelFormat.NV12, PixelFormat.I420):
+        return [(img, 1)]
+
+    # The number of rows being divisible by 3 also means that H is even
+    if img.ndim != 2 or img.shape[0] % 3 or img.shape[1] % 2:
+        raise ValueError(
+            f"Image of shape {img.shape} is not a valid {pixel_format.name} image,"
+            " it should have the shape (H * 3 / 2, W), with even H and W."
+        )
+
+    height, width = img.shape[0] * 2 // 3, img.shape[1]
+    luma, chroma = img[:height], img[height:]
+    if pixel_format == PixelFormat.NV12:
+        return [(luma, 1), (_reshape_view(chroma, (height // 2, width // 2, 2)), 2)]
+
+    # The U and V planes follow each other, each taking H * W / 4 bytes, which
+    # is not a whole number of rows if H is not divisible by 4
+    chroma_flat = _reshape_view(chroma, (-1,))
+    plane_size = height * width // 4
+    return [
+        (luma, 1),
+        (_reshape_view(chroma_flat[:plane_size], (height // 2, width // 2)), 2),
+        (_reshape_view(chroma_flat[plane_size:], (height // 2, width // 2)), 2),
+    ]
+
+
+def _reshape_view(arr: np.ndarray, shape: Tuple[int, ...]) -> np.ndarray:
+    """Reshape the array, raising an error if the result would not be a view."""
+
+    reshaped = arr.reshape(shape)
+    if not np.may_share_memory(reshaped, arr):
+        raise ValueError(
+            "The planes of the image can not be accessed without copying it, as"
+            " its memory layout is not contiguous (for example, it is a crop of"
+            " a larger image). Pass a contiguous image instead."
+        )
+
+    return reshaped
+
+
+def rectangle(
+    img: np.ndarray,
+    pixel_format: PixelFormat,
+    pt1: Tuple[int, int],
+    pt2: Tuple[int, int],
+    color: Tuple[int, int, int],
+    thickness: int,
+    undo: Optional[UndoToken] = None,
+):
+    """Draw a rectangle with an RGB color on each plane of the image.
+
+    If ``undo`` is set, the pixels under the rectangle are saved into it first.
+    """
+
+    planes = get_planes(img, pixel_format)
+    for plane_idx, ((plane, factor), plane_color) in enumerate(
+        zip(planes, convert_color(tuple(color), pixel_format))
+    ):
+        plane_pt1 = (pt1[0] // factor, pt1[1] // factor)
+        plane_pt2 = (pt2[0] // factor, pt2[1] // factor)
+        plane_thickness = thickness
+        if factor != 1 and thickness >= 0:
+            plane_thickness = max(1, thickness // factor)
+
+        if undo is not None:
+            _save_rectangle(
+                undo, plane_idx, plane, plane_pt1, plane_pt2, plane_thickness
+            )
+
+        cv2.rectangle(
+            plane,
+            pt1=plane_pt1,
+            pt2=plane_pt2,
+            color=plane_color,
+            thickness=plane_thickness,
+        )
+
+
+def _save_rectangle(
+    undo: UndoToken,
+    plane_idx: int,
+    plane: np.ndarray,
+    pt1: Tuple[int, int],
+    pt2: Tuple[int, int],
+    thickness: int,
+):
+    """Save the pixels that drawing a rectangle would change - only the outline,
+    unless it is filled."""
+
+    x0, x1 = min(pt1[0], pt2[0]), max(pt1[0], pt2[0])
+    y0, y1 = min(pt1[1], pt2[1]), max(pt1[1], pt2[1])
+
+    # Half-width of the lines, with a pixel to spare for rounding
+    half = thickness // 2 + 1
+    if thickness < 0 or 2 * half >= min(x1 - x0, y1 - y0):
+        undo.save(plane_idx, plane, x0 - half, y0 - half, x1 + half + 1, y1 + half + 1)
+        return
+
+    # Top and bottom strips, then left and right strips between them
+    for y in (y0, y1):
+        undo.save(plane_idx, plane, x0 - half, y - half, x1 + half + 1, y + half + 1)
+    for x in (x0, x1):
+        undo.save(plane_idx, plane, x - half, y0 + half + 1, x + half + 1, y1 - half)
+
+
+def get_text_size(
+    font: Font, text: str, font_height: int, quality: RenderQuality
+) -> Tuple[Tuple[int, int], int]:
+    """Get the size of the text, in the same format as FreeType ``getTextSize``.
+
+    With the ``BALANCED`` quality the sizes are cached, the same as the rendered
+    text, so that drawing a cached label does not call FreeType at all.
+    """
+
+    if quality == RenderQuality.FAST:
+        (width, height), baseline = cv2.getTextSize(
+            text, _HERSHEY_FONT, _hershey_scale(font_height), 1
+        )
+        return (width, height), baseline
+
+    if quality == RenderQuality.BALANCED:
+        return _text_size_cached(font, text, font_height)
+
+    return _text_size(font, text, font_height)
+
+
+def _text_size(font: Font, text: str, font_height: int) -> Tuple[Tuple[int, int], int]:
+    (width, height), baseline = font.font.getTextSize(text, font_height, -1)
+    return (width, height), baseline
+
+
+# Cached version of _text_size, for the BALANCED quality
+_text_size_cached = lru_cache(maxsize=1024)(_text_size)
+
+
+def put_text(
+    img: np.ndarray,
+    pixel_format: PixelFormat,
+    font: Font,
+    text: str,
+    org: Tuple[int, int],
+    font_height: int,
+    color: Tuple[int, int, int],
+    bottom_left_origin: bool,
+    quality: RenderQuality = RenderQuality.HIGH,
+    undo: Optional[UndoToken] = None,
+):
+    """Draw text with an RGB color on each plane of the image.
+
+    With the ``HIGH`` quality, text on 3-channel images is drawn by FreeType
+    directly. Otherwise (or for other pixel formats), the text coverage is rendered
+    into a small patch, which is then blended into each plane (subsampled for
+    chroma planes). With the ``BALANCED`` quality these patches are cached.
+    With the ``FAST`` quality the text is drawn with the Hershey font instead.
+
+    If ``undo`` is set, the pixels under the text are saved into it first.
+    """
+
+    planes = get_planes(img, pixel_format)
+    colors = convert_color(tuple(color), pixel_format)
+
+    if undo is not None:
+        _save_text(
+            undo, planes, font, text, org, font_height, bottom_left_origin, quality
+        )
+
+    if quality == RenderQuality.FAST:
+        scale = _hershey_scale(font_height)
+        if not bottom_left_origin:
+            (_, height), _ = get_text_size(font, text, font_height, quality)
+            org = (org[0], org[1] + height)
+
+        for (plane, factor), plane_color in zip(planes, colors):
+            _put_hershey_text(
+                plane,
+                text,
+                (org[0] // factor, org[1] // factor),
+                scale / factor,
+                plane_color,
+            )
+
+    elif quality == RenderQuality.HIGH and pixel_format in _FREETYPE_FORMATS:
+        font.font.putText(
+            img=img,
+            text=text,
+            org=org,
+            fontHeight=font_height,
+            color=colors[0],
+            thickness=-1,
+            line_type=cv2.LINE_AA,
+            bottomLeftOrigin=bottom_left_origin,
+        )
+
+    else:
+        get_coverage = (
+            _text_coverage_cached
+            if quality == RenderQuality.BALANCED
+            else _text_coverage
+        )
+        offset_x, offset_y, coverage = get_coverage(
+            font, text, font_height, bottom_left_origin
+        )
+        _blend_coverage(planes, colors, org[0] + offset_x, org[1] + offset_y, coverage)
+
+
+def _save_text(
+    undo: UndoToken,
+    planes: List[Tuple[np.ndarray, int]],
+    font: Font,
+    text: str,
+    org: Tuple[int, int],
+    font_height: int,
+    bottom_left_origin: bool,
+    quality: RenderQuality,
+):
+    """Save the pixels that drawing the text could change."""
+
+    if quality == RenderQuality.FAST:
+        if not bottom_left_origin:
+            (_, height), _ = get_text_size(font, text, font_height, quality)
+            org = (org[0], org[1] + height)
+
+        # Hershey strokes may extend one pixel beyond the reported text size
+        for plane_idx, (plane, factor) in enumerate(planes):
+            x, y = org[0] // factor, org[1] // factor
+            (width, height), baseline = cv2.getTextSize(
+                text, _HERSHEY_FONT, _hershey_scale(font_height) / factor, 1
+            )
+            undo.save(
+                plane_idx, plane, x - 1, y - height - 1, x + width + 1, y + baseline + 1
+            )
+        return
+
+    # FreeType only changes the pixels under the coverage of the text - it is
+    # rendered (and cached) also for the HIGH quality, to get its exact bounds
+    offset_x, offset_y, coverage = _text_coverage_cached(
+        font, text, font_height, bottom_left_origin
+    )
+    x0, y0 = org[0] + offset_x, org[1] + offset_y
+    x1, y1 = x0 + coverage.shape[1], y0 + coverage.shape[0]
+
+    for plane_idx, (plane, factor) in enumerate(planes):
+        undo.save(
+            plane_idx,
+            plane,
+            x0 // factor,
+            y0 // factor,
+            -(-x1 // factor),
+            -(-y1 // factor),
+        )
+
+
+def _hershey_scale(font_height: int) -> float:
+    return cv2.getFontScaleFromHeight(_HERSHEY_FONT, font_height, 1)
+
+
+def _put_hershey_text(
+    plane: np.ndarray,
+    text: str,
+    org: Tuple[int, int],
+    scale: float,
+    color: Tuple[int, ...],
+):
+    """Draw text with the Hershey font, without antialiasing."""
+
+    if plane.ndim == 2 or plane.shape[2] != 2:
+        cv2.putText(
+            plane,
+            text=text,
+            org=org,
+            fontFace=_HERSHEY_FONT,
+            fontScale=scale,
+            color=color,
+            thickness=1,
+            lineType=cv2.LINE_8,
+        )
+        return
+
+    # OpenCV can not draw text on 2-channel images, so draw a mask instead
+    (width, height), baseline = cv2.getTextSize(text, _HERSHEY_FONT, scale, 1)
+    x0, y0 = max(org[0] - 1, 0), max(org[1] - height - 1, 0)
+    x1 = min(org[0] + width + 1, plane.shape[1])
+    y1 = min(org[1] + baseline + 1, plane.shape[0])
+    if x1 <= x0 or y1 <= y0:
+        return
+
+    mask = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+    cv2.putText(
+        mask,
+        text=text,
+        org=(org[0] - x0, org[1] - y0),
+        fontFace=_HERSHEY_FONT,
+        fontScale=scale,
+        color=255,
+        thickness=1,
+        lineType=cv2.LINE_8,
+    )
+    roi = plane[slice(y0, y1), slice(x0, x1)]
+    np.copyto(roi, np.array(color, dtype=plane.dtype), where=mask[..., None] > 0)
+
+
+def _text_coverage(
+    font: Font, text: str, font_height: int, bottom_left_origin: bool
+) -> Tuple[int, int, np.ndarray]:
+    """Render the text coverage (0-255) into a patch tightly around the text.
+
+    Returns:
+        A tuple containing the offset of the top-left corner of the patch from the
+        text origin, and the patch.
+    """
+
+    (width, height), _ = font.font.getTextSize(text, font_height, -1)
+
+    # Leave a margin for glyphs that extend beyond the reported text size
+    margin = font_height
+    org = (margin, margin + height if bottom_left_origin else margin)
+
+    patch = np.zeros((height + 2 * margin, width + 2 * margin, 3), dtype=np.uint8)
+    font.font.putText(
+        img=patch,
+        text=text,
+        org=org,
+        fontHeight=font_height,
+        color=(255, 255, 255),
+        thickness=-1,
+        line_type=cv2.LINE_AA,
+        bottomLeftOrigin=bottom_left_origin,
+    )
+
+    coverage = patch[..., 0]
+    rows, cols = np.flatnonzero(coverage.any(1)), np.flatnonzero(coverage.any(0))
+    if len(rows) == 0:
+        return 0, 0, np.zeros((0, 0), dtype=np.uint8)
+
+    coverage = coverage[slice(rows[0], rows[-1] + 1), slice(cols[0], cols[-1] + 1)]
+    return int(cols[0]) - org[0], int(rows[0]) - org[1], coverage.copy()
+
+
+# Cached version of _text_coverage, for the BALANCED quality
+_text_coverage_cached = lru_cache(maxsize=1024)(_text_coverage)
+
+
+def _blend_coverage(
+    planes: List[Tuple[np.ndarray, int]],
+    colors: Tuple[Tuple[int, ...], ...],
+    x0: int,
+    y0: int,
+    coverage: np.ndarray,
+):
+    """Blend colors into planes, weighted by the coverage patch at ``(x0, y0)``."""
+
+    subsampled = any(factor != 1 for _, factor in planes)
+    if subsampled:
+        # Align the patch to even coordinates and size
+        pad_left, pad_top = x0 % 2, y0 % 2
+        pad_right = (coverage.shape[1] + pad_left) % 2
+        pad_bottom = (coverage.shape[0] + pad_top) % 2
+        coverage = np.pad(coverage, ((pad_top, pad_bottom), (pad_left, pad_right)))
+        x0, y0 = x0 - pad_left, y0 - pad_top
+
+    # Clip the patch to the image
+    img_height, img_width = planes[0][0].shape[:2]
+    x1 = min(x0 + coverage.shape[1], img_width)
+    y1 = min(y0 + coverage.shape[0], img_height)
+    clip_x0, clip_y0 = max(x0, 0), max(y0, 0)
+    if x1 <= clip_x0 or y1 <= clip_y0:
+        return
+
+    coverage = coverage[slice(clip_y0 - y0, y1 - y0), slice(clip_x0 - x0, x1 - x0)]
+    x0, y0 = clip_x0, clip_y0
+
+    # Chroma planes of all supported formats have the same subsampling
+    sub_coverage = coverage
+    if subsampled:
+        sub_coverage = cv2.resize(
+            coverage,
+            (coverage.shape[1] // 2, coverage.shape[0] // 2),
+            interpolation=cv2.INTER_AREA,
+        )
+
+    for (plane, factor), plane_color in zip(planes, colors):
+        plane_coverage = coverage if factor == 1 else sub_coverage
+        _blend(plane, x0 // factor, y0 // factor, plane_coverage, plane_color)
+
+
+def _blend(
+    plane: np.ndarray, x0: int, y0: int, coverage: np.ndarray, color: Sequence[int]
+):
+    """Blend a color into the plane, weighted by the coverage patch."""
+
+    height, width = coverage.shape
+    roi = plane[y0:, x0:][:height, :width]
+    if roi.ndim == 3 and roi.shape[2] == 1:
+        roi = roi[..., 0]
+
+    # OpenCV arithmetic is much faster than NumPy on small patches like these
+    n_channels = 1 if roi.ndim == 2 else roi.shape[2]
+    alpha = coverage if n_channels == 1 else cv2.merge([coverage] * n_channels)
+    color_scalar = np.array([c / 255 for c in color] + [0] * (4 - len(color)))
+
+    foreground = cv2.multiply(alpha, color_scalar)
+    background = cv2.multiply(roi, cv2.bitwise_not(alpha), scale=1 / 255)
+    cv2.add(background, foreground, dst=roi)
@@ -10,10 +10,12 @@ class Font:
     Attributes:
         font: The cv2 FreeType font, which enables drawing text on images with
             ``putText`` and getting the size of the  text with ``getTextSize``.
+        font_file: The path to the font file.
     """
 
     _default_font: Any
     font: Any
+    font_file: Path
 
     @classmethod
     def get_default(cls) -> Any:
@@ -26,5 +28,6 @@ class Font:
         return cls._default_font
 
     def __init__(self, font_file_name: Union[str, Path]):
+        self.font_file = Path(font_file_name)
         self.font = cv2.freetype.createFreeType2()
         self.font.loadFontData(fontFileName=str(font_file_name), id=0)
@@ -1,9 +1,9 @@
 from dataclasses import dataclass, field
 from typing import Optional, Sequence, Tuple
 
-import cv2  # type: ignore
 import numpy as np
 
+from .drawing import PixelFormat, RenderQuality, UndoToken, put_text, rectangle
 from .font import Font
 
 # Common colors
@@ -36,6 +36,8 @@ class InfoBox:
         font_height_title: The height of the title text.
         font_height_desc: The height of the description text.
         padding: How many pixels to pad the label background on each side.
+        pixel_format: The pixel format of images that are drawn on.
+        quality: The quality of rendering text, see :class:`RenderQuality`.
     """
 
     width: int
@@ -48,6 +50,8 @@ class InfoBox:
     font_height_title: int = 15
     font_height_desc: int = 15
     padding: int = 5
+    pixel_format: PixelFormat = PixelFormat.BGR
+    quality: RenderQuality = RenderQuality.HIGH
 
     def draw(
         self,
@@ -55,17 +59,26 @@ class InfoBox:
         orig_coords: Tuple[int, int],
         desc_lines: Sequence[str],
         title: Optional[str] = None,
-    ):
+        return_undo: bool = False,
+    ) -> Optional[UndoToken]:
         """Draw the info box.
 
         Args:
-            img: The image to draw on (will not be altered).
+            img: The image to draw on, in the ``pixel_format`` format.
             orig_coords: The top-left corner of the info box.
             desc_lines: The lines for the description.
             title: The text for the title. If not present, title
                 and its background will not be drawn.
+            return_undo: Whether to save the pixels under the info box, so that
+                it can be erased later.
+
+        Returns:
+            If ``return_undo`` is set, an :class:`UndoToken` which restores the
+            image when its ``restore`` method is called, otherwise ``None``.
         """
 
+        undo = UndoToken(img, self.pixel_format) if return_undo else None
+
         # Draw title box, if needed
         if title:
             title_orig = (
@@ -78,23 +91,27 @@ class InfoBox:
                 orig_coords[1] + self.font_height_title + 2 * self.padding,
             )
 
-            cv2.rectangle(
+            rectangle(
                 img,
+                self.pixel_format,
                 pt1=title_box_pt1,
                 pt2=title_box_pt2,
-                color=self.title_background_color[::-1],
+                color=self.title_background_color,
                 thickness=-1,
+                undo=undo,
             )
 
-            self.title_font.font.putText(
-                img=img,
+            put_text(
+                img,
+                self.pixel_format,
+                font=self.title_font,
                 text=title,
                 org=title_orig,
-                fontHeight=self.font_height_title,
-                color=self.title_text_color[::-1],
-                thickness=-1,
-                line_type=cv2.LINE_AA,
-                bottomLeftOrigin=True,
+                font_height=self.font_height_title,
+                color=self.title_text_color,
+                bottom_left_origin=True,
+                quality=self.quality,
+                undo=undo,
             )
 
             # Set orig_coords to below title box
@@ -111,12 +128,14 @@ class InfoBox:
             + (n_desc + 1) * self.padding,
         )
 
-        cv2.rectangle(
+        rectangle(
             img,
+            self.pixel_format,
             pt1=desc_box_pt1,
             pt2=desc_box_pt2,
-            color=self.desc_background_color[::-1],
+            color=self.desc_background_color,
             thickness=-1,
+            undo=undo,
         )
 
         # Draw description lines
@@ -126,13 +145,20 @@ class InfoBox:
                 orig_coords[1] + self.padding * (idx + 1) + self.font_height_desc * idx,
             )
 
-            self.desc_font.font.putText(
-                img=img,
+            put_text(
+                img,
+                self.pixel_format,
+                font=self.desc_font,
                 text=line,
                 org=line_orig,
-                fontHeight=self.font_height_desc,
-                color=self.desc_text_color[::-1],
-                thickness=-1,
-                line_type=cv2.LINE_AA,
-                bottomLeftOrigin=False,
+                font_height=self.font_height_desc,
+                color=self.desc_text_color,
+                bottom_left_origin=False,
+                quality=self.quality,
+                undo=undo,
             )
+
+        if undo is not None:
+            undo.compact()
+
+        return undo
@@ -0,0 +1,186 @@
+import bisect
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .mot import MOTFrame
+
+
+class InterpolationMode(Enum):
+    """Determines how boxes between keyframes are computed.
+
+    - ``LINEAR``: boxes are linearly interpolated between the keyframes before
+      and after the frame. This needs the next keyframe, so rendering has to be
+      delayed by one keyframe interval.
+    - ``CONSTANT_VELOCITY``: boxes are extrapolated from the last two keyframes
+      at or before the frame, assuming each track keeps its velocity. This only
+      uses past keyframes, so it can be used for live streams.
+    """
+
+    LINEAR = 1
+    CONSTANT_VELOCITY = 2
+
+
+@dataclass
+class _Keyframe:
+    ids: np.ndarray
+    bboxes: np.ndarray
+    scores: Optional[np.ndarray]
+
+
+@dataclass
+class BoxInterpolator:
+    """A class for interpolating boxes of tracks between sparse keyframes.
+
+    This is useful when the detector is run only on every k-th frame: the
+    detections from those frames are added as keyframes, and the boxes for the
+    frames in between are computed from them, for all tracks at once. The result
+    can be passed to :meth:`BBoxes.draw`, using ``ColorMode.IDS`` to keep the
+    colors of tracks consistent.
+
+    Tracks are matched between keyframes by their item IDs. A track appears at
+    the first keyframe it is in, and disappears after the last keyframe it is in
+    (it is not drawn on frames after that keyframe, once the next keyframe
+    without it is added).
+
+    Args:
+        mode: How to compute boxes between keyframes.
+        max_keyframes: The number of most recent keyframes to keep. When more
+            keyframes are added, the oldest ones are removed. If ``None``, all
+            keyframes are kept.
+    """
+
+    mode: InterpolationMode = InterpolationMode.LINEAR
+    max_keyframes: Optional[int] = 16
+
+    def __post_init__(self):
+        self._frames: List[int] = []
+        self._keyframes: Dict[int, _Keyframe] = {}
+
+    @property
+    def keyframes(self) -> List[int]:
+        """Sorted list of frame numbers of the kept keyframes."""
+
+        return list(self._frames)
+
+    def add_keyframe(
+        self,
+        frame: int,
+        bboxes: Union[Sequence[Tuple[int, int, int, int]], np.ndarray],
+        ids: Union[Sequence[int], np.ndarray],
+        scores: Union[Optional[Sequence[float]], np.ndarray] = None,
+    ):
+        """Add detections for a keyframe.
+
+        Keyframes can be added in any order, and adding a keyframe for the same
+        frame again replaces it.
+
+        Args:
+            frame: The frame number.
+            bboxes: Coordinates of bounding boxes in the ``[xmin, ymin, xmax,
+                ymax]`` format.
+            ids: Item IDs from tracking, which should be unique in the frame.
+            scores: The confidence (probability) of the detections.
+        """
+
+        bboxes_arr = np.asarray(bboxes, dtype=float).reshape(-1, 4)
+        ids_arr = np.asarray(ids, dtype=int).reshape(-1)
+
+        if len(ids_arr) != len(bboxes_arr):
+            raise ValueError("The `ids` should be the same lenght as the `bboxes`.")
+
+        if scores is not None and len(scores) != len(bboxes_arr):
+            raise ValueError("The `scores` should be the same lenght as the `bboxes`.")
+
+        # Sort by ID, so that tracks can be matched between keyframes quickly
+        order = np.argsort(ids_arr, kind="stable")
+        ids_arr = ids_arr[order]
+        if np.any(ids_arr[1:] == ids_arr[:-1]):
+            raise ValueError(f"The `ids` for frame {frame} should be unique.")
+
+        scores_arr = None
+        if scores is not None:
+            scores_arr = np.asarray(scores, dtype=float)[order]
+
+        if frame not in self._keyframes:
+            bisect.insort(self._frames, frame)
+        self._keyframes[frame] = _Keyframe(ids_arr, bboxes_arr[order], scores_arr)
+
+        if self.max_keyframes is not None:
+            while len(self._frames) > self.max_keyframes:
+                del self._keyframes[self._frames.pop(0)]
+
+    def interpolate(self, frame: int) -> MOTFrame:
+        """Get the boxes of all tracks for a frame.
+
+        For frames before the first keyframe, the result is empty. In the
+        ``LINEAR`` mode, for frames after the last keyframe the boxes of the last
+        keyframe are returned, until the next keyframe is added.
+
+        Args:
+            frame: The frame number.
+
+        Returns:
+            The boxes, IDs and scores of tracks in the frame. The scores are taken
+            from the last keyframe at or before the frame.
+        """
+
+        ind = bisect.bisect_right(self._frames, frame)
+        if ind == 0:
+            return MOTFrame(frame, np.zeros((0, 4), dtype=int), np.zeros(0, dtype=int))
+
+        prev_frame = self._frames[ind - 1]
+        prev = self._keyframes[prev_frame]
+
+        if self.mode == InterpolationMode.LINEAR:
+            if prev_frame == frame or ind == len(self._frames):
+                return self._to_frame(frame, prev, prev.bboxes)
+
+            next_frame = self._frames[ind]
+            next_ = self._keyframes[next_frame]
+            _, prev_inds, next_inds = np.intersect1d(
+                prev.ids, next_.ids, assume_unique=True, return_indices=True
+            )
+
+            weight = (frame - prev_frame) / (next_frame - prev_frame)
+            prev_bboxes = prev.bboxes[prev_inds]
+            bboxes = prev_bboxes + weight * (next_.bboxes[next_inds] - prev_bboxes)
+            return self._to_frame(frame, prev, bboxes, prev_inds)
+
+        # Constant velocity - tracks not in the second to last keyframe have just
+        # appeared, so their velocity is not known and they are kept in place
+        bboxes = prev.bboxes.copy()
+        if ind > 1 and frame != prev_frame:
+            before_frame = self._frames[ind - 2]
+            before = self._keyframes[before_frame]
+            _, before_inds, prev_inds = np.intersect1d(
+                before.ids, prev.ids, assume_unique=True, return_indices=True
+            )
+
+            velocity = (prev.bboxes[prev_inds] - before.bboxes[before_inds]) / (
+                prev_frame - before_frame
+            )
+            bboxes[prev_inds] += velocity * (frame - prev_frame)
+
+        return self._to_frame(frame, prev, bboxes)
+
+    def _to_frame(
+        self,
+        frame: int,
+        keyframe: _Keyframe,
+        bboxes: np.ndarray,
+        inds: Optional[np.ndarray] = None,
+    ) -> MOTFrame:
+        """Create a :class:`MOTFrame` with tracks of ``keyframe`` at ``inds``."""
+
+        if inds is None:
+            inds = np.arange(len(keyframe.ids))
+
+        return MOTFrame(
+            frame=frame,
+            bboxes=np.rint(bboxes).astype(int),
+            ids=keyframe.ids[inds],
+            scores=keyframe.scores[inds] if keyframe.scores is not None else None,
+        )
@@ -1,9 +1,16 @@
 from dataclasses import dataclass, field
 from typing import Optional, Tuple
 
-import cv2  # type: ignore
 import numpy as np
 
+from .drawing import (
+    PixelFormat,
+    RenderQuality,
+    UndoToken,
+    get_text_size,
+    put_text,
+    rectangle,
+)
 from .font import Font
 
 # Common colors
@@ -22,6 +29,8 @@ class Label:
             background will be drawn.
         font_height: Height of the text of the label.
         padding: How many pixels to pad the text on all sides for the background.
+        pixel_format: The pixel format of images that are drawn on.
+        quality: The quality of rendering text, see :class:`RenderQuality`.
     """
 
     font: Font = field(default_factory=Font.get_default)
@@ -29,23 +38,34 @@ class Label:
     background_color: Optional[Tuple[int, int, int]] = WHITE
     font_height: int = 25
     padding: int = 5
+    pixel_format: PixelFormat = PixelFormat.BGR
+    quality: RenderQuality = RenderQuality.HIGH
 
     def draw(
         self,
         img: np.ndarray,
         center_coords: Tuple[int, int],
         text: str,
-    ):
+        return_undo: bool = False,
+    ) -> Optional[UndoToken]:
         """Draw the label on the image.
 
         Args:
-            img: The image to draw on
+            img: The image to draw on, in the ``pixel_format`` format
             center_coords: The center of the label
             text: The text (label) to draw
+            return_undo: Whether to save the pixels under the label, so that it
+                can be erased later
+
+        Returns:
+            If ``return_undo`` is set, an :class:`UndoToken` which restores the
+            image when its ``restore`` method is called, otherwise ``None``.
         """
 
+        undo = UndoToken(img, self.pixel_format) if return_undo else None
+
         # Prepare coordinates
-        bsize = self.font.font.getTextSize(text, self.font_height, -1)
+        bsize = get_text_size(self.font, text, self.font_height, self.quality)
         text_orig = (
             center_coords[0] - bsize[0][0] // 2,
             center_coords[1] + bsize[0][1] // 2,
@@ -59,21 +79,30 @@ class Label:
 
         # Draw text and bounding box
         if self.background_color:
-            cv2.rectangle(
+            rectangle(
                 img,
+                self.pixel_format,
                 pt1=box_pt1,
                 pt2=box_pt2,
-                color=self.background_color[::-1],
+                color=self.background_color,
                 thickness=-1,
+                undo=undo,
             )
 
-        self.font.font.putText(
-            img=img,
+        put_text(
+            img,
+            self.pixel_format,
+            font=self.font,
             text=text,
             org=text_orig,
-            fontHeight=self.font_height,
-            color=self.text_color[::-1],
-            thickness=-1,
-            line_type=cv2.LINE_AA,
-            bottomLeftOrigin=True,
+            font_height=self.font_height,
+            color=self.text_color,
+            bottom_left_origin=True,
+            quality=self.quality,
+            undo=undo,
         )
+
+        if undo is not None:
+            undo.compact()
+
+        return undo
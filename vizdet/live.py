@@ -0,0 +1,261 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import Callable, Deque, Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .bboxes import BBoxes
+from .infobox import InfoBox
+
+# How many degraded frames to render before trying a full render again
+_PROBE_INTERVAL = 30
+
+# Weight of the newest measurement in the estimate of the render time
+_EMA_WEIGHT = 0.2
+
+# How long (in seconds) to wait for the source thread when the run ends. The
+# source may be blocked reading a frame, in which case the thread stops by itself
+# once the read returns.
+_JOIN_TIMEOUT = 0.1
+
+
+@dataclass
+class LiveFrame:
+    """A frame from a live source, together with the detections to draw on it.
+
+    Args:
+        image: The frame, which will be drawn on in place.
+        bboxes: Coordinates of bounding boxes, as in :meth:`BBoxes.draw`.
+        ids: Item IDs from tracking.
+        labels: Item labels (classes).
+        scores: The confidence (probability) of the labels.
+        info: The description lines for the info box.
+        timestamp: The time (from ``time.perf_counter``) when the frame was
+            captured. If not set, the time when the frame was received from the
+            source is used.
+    """
+
+    image: np.ndarray
+    bboxes: Union[Sequence[Tuple[int, int, int, int]], np.ndarray]
+    ids: Union[Optional[Sequence[int]], np.ndarray] = None
+    labels: Union[Optional[Sequence[Union[str, int]]], np.ndarray] = None
+    scores: Union[Optional[Sequence[float]], np.ndarray] = None
+    info: Optional[Sequence[str]] = None
+    timestamp: Optional[float] = None
+
+
+@dataclass
+class LiveStats:
+    """Statistics of a run of :class:`LiveAnnotator`.
+
+    Args:
+        rendered: The number of frames rendered (fully or degraded).
+        degraded: The number of frames rendered without labels and info box.
+        dropped: The number of frames dropped, because a newer frame arrived
+            before they were picked up.
+        p50_latency: The median latency (in seconds) from the capture of a frame
+            to the end of drawing on it, for rendered frames.
+        p99_latency: The 99th percentile of the latency (in seconds).
+    """
+
+    rendered: int = 0
+    degraded: int = 0
+    dropped: int = 0
+    p50_latency: float = 0.0
+    p99_latency: float = 0.0
+
+
+class _LatestFrameSlot:
+    """A single-slot buffer, where a new frame replaces the one not yet taken."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._frame: Optional[LiveFrame] = None
+        self._closed = False
+        self.overwritten = 0
+
+    def put(self, frame: LiveFrame):
+        with self._cond:
+            if self._frame is not None:
+                self.overwritten += 1
+            self._frame = frame
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+    def get(self) -> Optional[LiveFrame]:
+        """Wait for the latest frame, return ``None`` if the slot is closed."""
+
+        with self._cond:
+            while self._frame is None and not self._closed:
+                self._cond.wait()
+
+            frame, self._frame = self._frame, None
+            return frame
+
+
+@dataclass
+class LiveAnnotator:
+    """A class for annotating live streams while keeping the latency bounded.
+
+    Frames are read from the source in a background thread into a single-slot
+    buffer, which only holds the latest frame - if drawing falls behind, frames
+    that were not picked up in time are dropped, instead of accumulating lag.
+
+    Before drawing on a frame, its age is compared to ``target_latency``. If the
+    frame is already too old, or a full render (with labels and the info box) is
+    expected to exceed the target latency, a degraded render (only bounding
+    boxes) is done instead. Frames that were picked up are never dropped, as they
+    are the newest ones available - dropping them would only leave the output
+    without frames.
+
+    Args:
+        bboxes: The object used to draw bounding boxes.
+        infobox: The object used to draw the info box. If not set, the info box is
+            not drawn.
+        infobox_coords: The top-left corner of the info box.
+        infobox_title: The title of the info box.
+        target_latency: The target latency (in seconds) from the capture of a frame
+            to the end of drawing on it.
+        max_latencies: The number of most recent latencies kept for statistics.
+    """
+
+    bboxes: BBoxes = field(default_factory=BBoxes)
+    infobox: Optional[InfoBox] = None
+    infobox_coords: Tuple[int, int] = (0, 0)
+    infobox_title: Optional[str] = None
+    target_latency: float = 0.05
+    max_latencies: int = 10000
+
+    def __post_init__(self):
+        self._stop = threading.Event()
+        self._slot: Optional[_LatestFrameSlot] = None
+
+    def stop(self):
+        """Stop the current run, after the frame that is being drawn.
+
+        This also stops a run that is waiting for the next frame from the source.
+        """
+
+        self._stop.set()
+        if self._slot is not None:
+            self._slot.close()
+
+    def _render(self, frame: LiveFrame, degraded: bool):
+        self.bboxes.draw(
+            frame.image,
+            frame.bboxes,
+            ids=frame.ids,
+            labels=frame.labels,
+            scores=frame.scores,
+            show_labels=not degraded,
+        )
+
+        if not degraded and self.infobox is not None and frame.info is not None:
+            self.infobox.draw(
+                frame.image, self.infobox_coords, frame.info, self.infobox_title
+            )
+
+    def run(
+        self,
+        source: Iterable[LiveFrame],
+        sink: Callable[[np.ndarray], None],
+    ) -> LiveStats:
+        """Annotate frames from the source and pass them to the sink.
+
+        The method returns when the source is exhausted, or when :meth:`stop`
+        is called. A read from the source that is in progress at that time is
+        not interrupted, but no further frames are read.
+
+        Args:
+            source: An iterable of frames, such as a generator reading frames from
+                a camera. It is consumed in a background thread.
+            sink: A function called with each annotated image, for example to
+                display or encode it.
+
+        Returns:
+            Statistics of the run.
+        """
+
+        # Each run has its own stop event and slot, so that a source thread of a
+        # previous run which is still blocked on reading never reads further
+        stop = self._stop = threading.Event()
+        slot = self._slot = _LatestFrameSlot()
+        errors = []
+
+        def _produce():
+            try:
+                for frame in source:
+                    if stop.is_set():
+                        break
+                    if frame.timestamp is None:
+                        frame = replace(frame, timestamp=time.perf_counter())
+                    slot.put(frame)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                slot.close()
+
+        producer = threading.Thread(target=_produce, daemon=True)
+        producer.start()
+
+        stats = LiveStats()
+        latencies: Deque[float] = deque(maxlen=self.max_latencies)
+        render_estimate: Optional[float] = None
+        n_degraded_in_row = 0
+
+        try:
+            while not stop.is_set():
+                frame = slot.get()
+                if frame is None:
+                    break
+
+                start = time.perf_counter()
+                age = start - frame.timestamp  # type: ignore
+
+                # This is the newest frame, so dropping it would not reduce the lag -
+                # if it is already too old, draw it as fast as possible instead.
+                # Otherwise degrade if the full render is expected to be too slow,
+                # but occasionally try the full render to update the estimate.
+                degraded = age > self.target_latency or (
+                    render_estimate is not None
+                    and age + render_estimate > self.target_latency
+                    and n_degraded_in_row < _PROBE_INTERVAL
+                )
+                self._render(frame, degraded)
+                end = time.perf_counter()
+
+                if degraded:
+                    stats.degraded += 1
+                    n_degraded_in_row += 1
+                else:
+                    n_degraded_in_row = 0
+                    if render_estimate is None:
+                        render_estimate = end - start
+                    else:
+                        render_estimate += _EMA_WEIGHT * (end - start - render_estimate)
+
+                stats.rendered += 1
+                latencies.append(end - frame.timestamp)  # type: ignore
+
+                sink(frame.image)
+        finally:
+            # Also stop reading the source if drawing or the sink failed
+            stop.set()
+            slot.close()
+            producer.join(_JOIN_TIMEOUT)
+
+        if errors:
+            raise errors[0]
+
+        stats.dropped += slot.overwritten
+        if latencies:
+            p50, p99 = np.percentile(latencies, [50, 99])
+            stats.p50_latency, stats.p99_latency = float(p50), float(p99)
+
+        return stats
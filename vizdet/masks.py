@@ -0,0 +1,190 @@
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple, Union
+
+import cv2  # type: ignore
+import numpy as np
+
+from .bboxes import VIBRANT_COLOR_LIST, ColorMode, _get_color
+
+
+@dataclass
+class Masks:
+    """The class for drawing segmentation masks of detected objects.
+
+    Masks can be passed either as a label map, where each pixel holds the label
+    (or item id) of the object it belongs to, or as a stack of binary masks, one
+    for each object. The masks are colored in the same way as bounding boxes in
+    :class:`BBoxes`, and blended with the image.
+
+    All masks are colored with a single lookup in a palette of colors, and only
+    the part of the image covered by the bounding box of all the masks is blended,
+    so the cost of drawing does not grow with the number of objects.
+
+    Args:
+        labels_list: A list of possible labels. If set, the labels (or values of the
+            label map) should be integer indices corresponding to the labels in
+            ``labels_list``.
+        bbox_color_list: A list of colors in RGB format to use for masks.
+        color_mode: Whether to color masks based on class or item ids.
+        alpha: Opacity of the masks, between 0 and 1.
+        background: The value in the label map which marks the background, which
+            is not drawn. If set to ``None``, all values are drawn.
+    """
+
+    labels_list: Optional[Sequence[str]] = None
+    bbox_color_list: Sequence[Tuple[int, int, int]] = VIBRANT_COLOR_LIST
+    color_mode: ColorMode = ColorMode.LABELS
+    alpha: float = 0.5
+    background: Optional[int] = 0
+
+    def _check_label_index(self, max_label: int):
+        """Check that labels are valid indices of ``labels_list``, if it is set."""
+
+        if self.labels_list and max_label >= len(self.labels_list):
+            raise IndexError(
+                f"Label index `{max_label}` is not value for `labels_list`"
+                f" of length {len(self.labels_list)}"
+            )
+
+    def _label_map_palette(self, label_map: np.ndarray) -> np.ndarray:
+        """Get the BGR palette, with the color of value ``v`` at ``v % len(palette)``.
+
+        This matches the colors that :class:`BBoxes` uses for the same label or id,
+        for any (also negative) integer value.
+        """
+
+        if self.color_mode == ColorMode.LABELS:
+            self._check_label_index(int(label_map.max()))
+
+        return np.array(self.bbox_color_list, dtype=np.uint8)[:, ::-1]
+
+    def _instances_palette(
+        self,
+        n_masks: int,
+        ids: Union[Optional[Sequence[int]], np.ndarray],
+        labels: Union[Optional[Sequence[Union[str, int]]], np.ndarray],
+    ) -> np.ndarray:
+        """Get the BGR palette, where the color of mask ``i`` is at index ``i + 1``."""
+
+        if self.labels_list and labels is not None:
+            for label in labels:
+                if not isinstance(label, (int, np.integer)):
+                    raise TypeError(
+                        f"Label `{label}` is not an integer; if you supply"
+                        " `label_list`, then labels must be integer indices."
+                    )
+            self._check_label_index(max(labels, default=0))
+
+        palette = np.zeros((n_masks + 1, 3), dtype=np.uint8)
+        for idx in range(n_masks):
+            item_id = ids[idx] if ids is not None else None
+            label = labels[idx] if labels is not None else None
+            color = _get_color(self.bbox_color_list, self.color_mode, label, item_id)
+            palette[idx + 1] = color[::-1]
+
+        return palette
+
+    @staticmethod
+    def _stack_to_index_map(masks: np.ndarray) -> np.ndarray:
+        """Collapse the stack of masks into a map of (1-based) index of the top mask.
+
+        Each mask is read in full once, to find its bounding box, and then only
+        written to the map within it.
+        """
+
+        index_map = np.zeros(masks.shape[1:], dtype=np.int32)
+        rows_any: np.ndarray = np.any(masks, axis=2)
+        for idx in np.flatnonzero(rows_any.any(axis=1)):
+            rows = np.flatnonzero(rows_any[idx])
+            row_slice = slice(rows[0], rows[-1] + 1)
+
+            cols = np.flatnonzero(masks[idx, row_slice].any(axis=0))
+            roi = (row_slice, slice(cols[0], cols[-1] + 1))
+            np.copyto(index_map[roi], idx + 1, where=masks[idx][roi].astype(bool))
+
+        return index_map
+
+    def draw(
+        self,
+        img: np.ndarray,
+        masks: np.ndarray,
+        ids: Union[Optional[Sequence[int]], np.ndarray] = None,
+        labels: Union[Optional[Sequence[Union[str, int]]], np.ndarray] = None,
+    ):
+        """Draw the masks on the image.
+
+        If ``masks`` is a label map (an integer array of shape ``(H, W)``), each
+        value is used as the label for coloring, or as the item id, if
+        ``color_mode`` is set to ``ColorMode.IDS``. Pixels equal to ``background``
+        are not drawn. In this case ``ids`` and ``labels`` should not be passed.
+
+        If ``masks`` is a stack of binary masks (an array of shape ``(N, H, W)``),
+        each mask is colored based on its label or item id, as in
+        :meth:`BBoxes.draw`. Where masks overlap, the later mask is drawn on top.
+
+        This method edits the ``img`` in place and does not return any value.
+
+        Args:
+            img: The image to draw masks on.
+            masks: The label map or the stack of binary masks, with the same height
+                and width as ``img``.
+            ids: Item IDs from tracking, for each mask in the stack.
+            labels: Item labels (classes), for each mask in the stack. If
+                ``labels_list`` is set labels should be integers corresponding to
+                indices of that list.
+        """
+
+        if masks.shape[-2:] != img.shape[:2]:
+            raise ValueError(
+                "The `masks` should have the same height and width as the `img`."
+            )
+
+        if masks.ndim == 2:
+            if ids is not None or labels is not None:
+                raise ValueError(
+                    "The `ids` and `labels` can not be passed with a label map."
+                )
+
+            if self.background is not None:
+                mask = masks != self.background
+            else:
+                mask = np.ones(masks.shape, dtype=bool)
+
+            # Nothing to draw
+            if not mask.any():
+                return
+
+            index_map = masks
+            palette = self._label_map_palette(masks)
+
+        elif masks.ndim == 3:
+            n_masks = len(masks)
+            if ids is not None and len(ids) != n_masks:
+                raise ValueError("The `ids` should be the same lenght as the `masks`.")
+
+            if labels is not None and len(labels) != n_masks:
+                raise ValueError(
+                    "The `labels` should be the same lenght as the `masks`."
+                )
+
+            index_map = self._stack_to_index_map(masks)
+            mask = index_map > 0
+            palette = self._instances_palette(n_masks, ids, labels)
+
+            # Nothing to draw
+            if not mask.any():
+                return
+
+        else:
+            raise ValueError("The `masks` should have either 2 or 3 dimensions.")
+
+        # Blend only inside the bounding box of all masks
+        rows, cols = np.flatnonzero(mask.any(axis=1)), np.flatnonzero(mask.any(axis=0))
+        roi = (slice(rows[0], rows[-1] + 1), slice(cols[0], cols[-1] + 1))
+
+        # Values of a label map can be any integers, so they wrap around the palette,
+        # while indices of stacked masks are always within it
+        img_roi = img[roi]
+        colored = palette.astype(img.dtype)[np.remainder(index_map[roi], len(palette))]
+        blended = cv2.addWeighted(img_roi, 1 - self.alpha, colored, self.alpha, 0)
+        np.copyto(img_roi, blended, where=mask[roi][..., None])
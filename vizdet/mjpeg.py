@@ -0,0 +1,199 @@
+import asyncio
+import threading
+from typing import Dict, Optional, Set
+
+import cv2  # type: ignore
+import numpy as np
+
+# Separator between JPEG images in the multipart stream
+_BOUNDARY = b"frame"
+
+_STREAM_HEADER = (
+    b"HTTP/1.0 200 OK\r\n"
+    b"Cache-Control: no-cache, private\r\n"
+    b"Pragma: no-cache\r\n"
+    b"Content-Type: multipart/x-mixed-replace; boundary=" + _BOUNDARY + b"\r\n\r\n"
+)
+
+_NOT_ALLOWED = (
+    b"HTTP/1.0 405 Method Not Allowed\r\nAllow: GET\r\nContent-Length: 0\r\n\r\n"
+)
+
+
+class MJPEGServer:
+    """An HTTP server streaming annotated frames as MJPEG to any number of clients.
+
+    Each published frame is encoded to JPEG once, and the same bytes are sent to
+    all connected clients, so the cost of encoding does not grow with the number
+    of clients. If no clients are connected, frames are not encoded at all.
+
+    The server runs an asyncio event loop in a background thread, so
+    :meth:`publish` can be called from a regular (synchronous) drawing loop.
+    Each client has a queue holding only one frame: if a client does not keep up,
+    the frame waiting for it is replaced by the newer one, instead of frames
+    accumulating in memory.
+
+    The server can be used as a context manager, which starts it on enter and
+    stops it on exit. The stream can be viewed by opening
+    ``http://<host>:<port>/`` in a browser.
+
+    Args:
+        host: The host (interface) to listen on.
+        port: The port to listen on. If set to 0, a free port is chosen, which
+            is available as :attr:`port` after the server is started.
+        quality: The JPEG quality, from 0 to 100.
+
+    Attributes:
+        dropped: The number of frames that were dropped for slow clients.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8080, quality: int = 80):
+        if not 0 <= quality <= 100:
+            raise ValueError(
+                f"The `quality` should be between 0 and 100, got {quality}."
+            )
+
+        self.host = host
+        self.port = port
+        self.quality = quality
+
+        self.dropped = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._queues: Set["asyncio.Queue[bytes]"] = set()
+        self._clients: Dict["asyncio.Task[None]", asyncio.StreamWriter] = {}
+
+    @property
+    def n_clients(self) -> int:
+        """The number of currently connected clients."""
+
+        return len(self._queues)
+
+    def __enter__(self) -> "MJPEGServer":
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        """Start listening for clients, in a background thread."""
+
+        if self._loop is not None:
+            raise RuntimeError("The server is already running.")
+
+        loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=loop.run_forever, daemon=True)
+        self._thread.start()
+        self._loop = loop
+
+        try:
+            asyncio.run_coroutine_threadsafe(self._start_server(), loop).result()
+        except BaseException:
+            self.stop()
+            raise
+
+    def stop(self):
+        """Disconnect all clients and stop the server."""
+
+        if self._loop is None:
+            return
+
+        asyncio.run_coroutine_threadsafe(self._stop_server(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()  # type: ignore
+        self._loop.close()
+        self._loop, self._thread = None, None
+
+    def publish(self, img: np.ndarray):
+        """Encode the image and send it to all connected clients.
+
+        Args:
+            img: The image in BGR (or grayscale) format, as used for drawing.
+        """
+
+        if self._loop is None:
+            raise RuntimeError("The server is not running, call `start` first.")
+
+        if not self._queues:
+            return
+
+        success, data = cv2.imencode(
+            ".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, self.quality]
+        )
+        if not success:
+            raise ValueError("The image could not be encoded to JPEG.")
+
+        part = (
+            b"--%s\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n"
+            % (_BOUNDARY, data.size)
+            + data.tobytes()
+            + b"\r\n"
+        )
+        self._loop.call_soon_threadsafe(self._fan_out, part)
+
+    def _fan_out(self, part: bytes):
+        for queue in self._queues:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(part)
+
+    async def _start_server(self):
+        self._server = await asyncio.start_server(
+            self._handle_client, self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def _stop_server(self):
+        if self._server is None:
+            return
+
+        # Stop accepting new clients, then disconnect the current ones - the
+        # server can only be closed once all connections are closed. Connections
+        # are aborted, as slow clients may never read the data pending for them.
+        self._server.close()
+        for task, writer in self._clients.items():
+            task.cancel()
+            writer.transport.abort()
+        await asyncio.gather(*self._clients, return_exceptions=True)
+
+        await self._server.wait_closed()
+        self._server = None
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        # The server is being stopped
+        if self._server is not None and not self._server.is_serving():
+            writer.transport.abort()
+            return
+
+        task = asyncio.current_task()
+        self._clients[task] = writer  # type: ignore
+        queue: "asyncio.Queue[bytes]" = asyncio.Queue(maxsize=1)
+
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()).strip():
+                pass
+
+            if not request_line.startswith(b"GET "):
+                writer.write(_NOT_ALLOWED)
+                await writer.drain()
+                return
+
+            writer.write(_STREAM_HEADER)
+            await writer.drain()
+
+            self._queues.add(queue)
+            while True:
+                writer.write(await queue.get())
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._queues.discard(queue)
+            self._clients.pop(task, None)  # type: ignore
+            writer.close()
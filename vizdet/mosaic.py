@@ -0,0 +1,259 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Any, Optional, Sequence, Tuple, Union
+
+import cv2  # type: ignore
+import numpy as np
+
+from .bboxes import BLACK, BBoxes
+from .font import Font
+from .infobox import InfoBox
+
+# Type of bounding boxes of a single frame
+_BBoxesType = Union[Sequence[Tuple[int, int, int, int]], np.ndarray]
+
+
+@dataclass
+class Mosaic:
+    """A class for composing multiple annotated streams into a grid.
+
+    The mosaic owns a single canvas, which is allocated once. Frames are resized
+    directly into their cell of the canvas, and bounding boxes (rescaled to the
+    size of the cell) and the header info box are drawn on the cell in place, so
+    no intermediate copies of frames are made.
+
+    Cells are rendered in parallel, in a pool of threads. As FreeType fonts can
+    not be used from multiple threads at once, each thread uses its own copy of
+    the fonts of ``bboxes`` and ``infobox``.
+
+    The mosaic can be used as a context manager, which shuts down the thread pool
+    on exit; otherwise :meth:`close` should be called when it is no longer needed.
+
+    Args:
+        rows: The number of rows of cells.
+        cols: The number of columns of cells.
+        cell_width: The width (in pixels) of each cell.
+        cell_height: The height (in pixels) of each cell.
+        bboxes: The object used to draw bounding boxes in each cell.
+        infobox: The object used to draw the header of each cell. If not set,
+            headers can not be drawn.
+        background_color: The RGB color of cells without a frame.
+        interpolation: The OpenCV interpolation method used for resizing frames.
+        max_workers: The number of threads used for rendering cells. If set to 1,
+            cells are rendered in the calling thread.
+    """
+
+    rows: int
+    cols: int
+    cell_width: int
+    cell_height: int
+    bboxes: BBoxes = field(default_factory=BBoxes)
+    infobox: Optional[InfoBox] = None
+    background_color: Tuple[int, int, int] = BLACK
+    interpolation: int = cv2.INTER_LINEAR
+    max_workers: Optional[int] = None
+
+    canvas: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.canvas = np.empty(
+            (self.rows * self.cell_height, self.cols * self.cell_width, 3),
+            dtype=np.uint8,
+        )
+        self.canvas[:] = self.background_color[::-1]
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._local = threading.local()
+
+    def __enter__(self) -> "Mosaic":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Shut down the thread pool used for rendering."""
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def cell(self, idx: int) -> np.ndarray:
+        """Get the view of the canvas for a cell.
+
+        Cells are numbered row by row, starting with 0 in the top left corner.
+        Drawing on the view draws directly on the canvas.
+        """
+
+        if not 0 <= idx < self.rows * self.cols:
+            raise IndexError(
+                f"Cell index `{idx}` is not valid for a mosaic with"
+                f" {self.rows * self.cols} cells."
+            )
+
+        row, col = divmod(idx, self.cols)
+        top, left = row * self.cell_height, col * self.cell_width
+        return self.canvas[
+            slice(top, top + self.cell_height), slice(left, left + self.cell_width)
+        ]
+
+    def _get_font(self, font: Font) -> Font:
+        """Get a copy of the font that can be used by the current thread."""
+
+        fonts = getattr(self._local, "fonts", None)
+        if fonts is None:
+            fonts = self._local.fonts = {}
+
+        if font.font_file not in fonts:
+            fonts[font.font_file] = Font(font.font_file)
+
+        return fonts[font.font_file]
+
+    def _get_drawers(self) -> Tuple[BBoxes, Optional[InfoBox]]:
+        """Get the drawers with fonts that can be used by the current thread.
+
+        The drawers are shallow copies of ``bboxes`` and ``infobox`` made for each
+        cell, so changes to their settings always take effect; only the (costly to
+        load) fonts are kept for each thread.
+        """
+
+        if self.max_workers == 1:
+            return self.bboxes, self.infobox
+
+        bboxes = replace(self.bboxes, font=self._get_font(self.bboxes.font))
+        infobox = None
+        if self.infobox is not None:
+            infobox = replace(
+                self.infobox,
+                title_font=self._get_font(self.infobox.title_font),
+                desc_font=self._get_font(self.infobox.desc_font),
+            )
+
+        return bboxes, infobox
+
+    def draw_cell(
+        self,
+        idx: int,
+        frame: Optional[np.ndarray],
+        bboxes: Optional[_BBoxesType] = None,
+        ids: Union[Optional[Sequence[int]], np.ndarray] = None,
+        labels: Union[Optional[Sequence[Union[str, int]]], np.ndarray] = None,
+        scores: Union[Optional[Sequence[float]], np.ndarray] = None,
+        title: Optional[str] = None,
+        desc_lines: Optional[Sequence[str]] = None,
+    ) -> np.ndarray:
+        """Draw a frame with its annotations into a cell.
+
+        Args:
+            idx: The index of the cell, see :meth:`cell`.
+            frame: The frame to draw. It is resized to the size of the cell. If
+                ``None``, the cell is filled with ``background_color``.
+            bboxes: Coordinates of bounding boxes in the frame, in the format
+                expected by :meth:`BBoxes.draw`. They are rescaled to the cell.
+            ids: Item IDs from tracking.
+            labels: Item labels (classes).
+            scores: The confidence (probability) of the labels.
+            title: The title of the header info box.
+            desc_lines: The description lines of the header info box.
+
+        Returns:
+            The view of the canvas for the cell.
+        """
+
+        cell = self.cell(idx)
+        if frame is None:
+            cell[:] = self.background_color[::-1]
+            return cell
+
+        frame_height, frame_width = frame.shape[:2]
+        if (frame_width, frame_height) == (self.cell_width, self.cell_height):
+            np.copyto(cell, frame)
+        else:
+            cv2.resize(
+                frame,
+                (self.cell_width, self.cell_height),
+                dst=cell,
+                interpolation=self.interpolation,
+            )
+
+        bboxes_drawer, infobox_drawer = self._get_drawers()
+
+        if bboxes is not None and len(bboxes):
+            scale = np.array(
+                [self.cell_width / frame_width, self.cell_height / frame_height] * 2
+            )
+            cell_bboxes = np.rint(np.asarray(bboxes) * scale).astype(int)
+            bboxes_drawer.draw(cell, cell_bboxes, ids=ids, labels=labels, scores=scores)
+
+        if title or desc_lines:
+            if infobox_drawer is None:
+                raise ValueError("The `infobox` needs to be set to draw headers.")
+            infobox_drawer.draw(cell, (0, 0), desc_lines or [], title)
+
+        return cell
+
+    def draw(
+        self,
+        frames: Sequence[Optional[np.ndarray]],
+        bboxes: Optional[Sequence[Optional[_BBoxesType]]] = None,
+        ids: Optional[Sequence[Any]] = None,
+        labels: Optional[Sequence[Any]] = None,
+        scores: Optional[Sequence[Any]] = None,
+        titles: Optional[Sequence[Optional[str]]] = None,
+        desc_lines: Optional[Sequence[Optional[Sequence[str]]]] = None,
+    ) -> np.ndarray:
+        """Draw frames with their annotations into all cells, in parallel.
+
+        All arguments are sequences with one element for each frame (cell),
+        with the meaning as in :meth:`draw_cell`. Frames are drawn into cells in
+        order; if there are fewer frames than cells, the rest of cells are left
+        as they are.
+
+        Returns:
+            The canvas, which is reused for the next call to this method.
+        """
+
+        n_cells = self.rows * self.cols
+        if len(frames) > n_cells:
+            raise ValueError(
+                f"Got {len(frames)} frames, but the mosaic only has {n_cells} cells."
+            )
+
+        for name, arg in (
+            ("bboxes", bboxes),
+            ("ids", ids),
+            ("labels", labels),
+            ("scores", scores),
+            ("titles", titles),
+            ("desc_lines", desc_lines),
+        ):
+            if arg is not None and len(arg) != len(frames):
+                raise ValueError(
+                    f"The `{name}` should be the same lenght as the `frames`."
+                )
+
+        def _draw(idx: int):
+            self.draw_cell(
+                idx,
+                frames[idx],
+                bboxes=bboxes[idx] if bboxes is not None else None,
+                ids=ids[idx] if ids is not None else None,
+                labels=labels[idx] if labels is not None else None,
+                scores=scores[idx] if scores is not None else None,
+                title=titles[idx] if titles is not None else None,
+                desc_lines=desc_lines[idx] if desc_lines is not None else None,
+            )
+
+        if self.max_workers == 1:
+            for idx in range(len(frames)):
+                _draw(idx)
+        else:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+            # Consume results to re-raise any errors
+            for _ in self._executor.map(_draw, range(len(frames))):
+                pass
+
+        return self.canvas
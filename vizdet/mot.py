@@ -0,0 +1,371 @@
+import contextlib
+import os
+import tempfile
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Iterator, List, Optional, Union
+
+import numpy as np
+
+# Columns of the MOTChallenge format that are used
+_FRAME_COL, _ID_COL, _BBOX_COLS, _SCORE_COL = 0, 1, slice(2, 6), 6
+
+# Byte value of the line separator
+_NEWLINE = ord("\n")
+
+# Characters that a line may contain and still be considered empty
+_WHITESPACE = b" \t\r\n"
+
+
+@dataclass
+class MOTFrame:
+    """Tracking results for a single frame, in a format ready for :meth:`BBoxes.draw`.
+
+    Args:
+        frame: The frame number, as given in the file.
+        bboxes: Integer array of shape ``(N, 4)`` with bounding boxes in the
+            ``[xmin, ymin, xmax, ymax]`` format.
+        ids: Integer array of shape ``(N,)`` with item IDs.
+        scores: Float array of shape ``(N,)`` with the confidence scores, or
+            ``None`` if the file does not contain the score column.
+    """
+
+    frame: int
+    bboxes: np.ndarray
+    ids: np.ndarray
+    scores: Optional[np.ndarray] = None
+
+
+class MOTReader:
+    """A class for reading tracking results in the MOTChallenge format.
+
+    The file should contain one object per line, in the comma separated
+    ``frame, id, x, y, w, h, score, ...`` format (the score and any columns after
+    it are optional). Lines for the same frame do not need to be next to each
+    other, but reading is fastest if the file is sorted by frame.
+
+    On first use the file is scanned once (in chunks, parsing them with NumPy)
+    to build an index of byte offsets of each frame. The index is saved next
+    to the file, so that later readers can seek to any frame straight away.
+    The index is rebuilt automatically if the file changes.
+
+    Frames are read lazily, either by iterating over the reader, or by indexing
+    it with the frame number, for example ``reader[5]``.
+
+    Args:
+        file_name: Path to the file with tracking results.
+        index_file_name: Path where to store the index. If not set, the index is
+            stored in the same directory as the file, with ``.idx`` appended to
+            the name.
+        save_index: Whether to save the index to disk (and load it, if it exists).
+        chunk_size: Approximate size (in bytes) of chunks that the file is read in.
+    """
+
+    def __init__(
+        self,
+        file_name: Union[str, Path],
+        index_file_name: Optional[Union[str, Path]] = None,
+        save_index: bool = True,
+        chunk_size: int = 2**24,
+    ):
+        self.file_name = Path(file_name)
+        if index_file_name is None:
+            index_file_name = self.file_name.with_name(self.file_name.name + ".idx")
+
+        self.index_file_name = Path(index_file_name)
+        self.save_index = save_index
+        self.chunk_size = chunk_size
+
+        self._file: Optional[IO[bytes]] = None
+        self._n_cols = 0
+        self._frames = np.zeros(0, dtype=np.int64)
+        self._starts = np.zeros(0, dtype=np.int64)
+        self._ends = np.zeros(0, dtype=np.int64)
+        self._indexed = False
+
+    @property
+    def frames(self) -> np.ndarray:
+        """Sorted array of frame numbers with at least one object."""
+
+        self._ensure_index()
+        return np.unique(self._frames)
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def __enter__(self) -> "MOTReader":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the underlying file."""
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __getitem__(self, frame: int) -> MOTFrame:
+        """Read the tracking results for a frame.
+
+        If there are no objects for the frame, the arrays in the result will be empty.
+        """
+
+        self._ensure_index()
+        start, end = np.searchsorted(self._frames, [frame, frame + 1])
+        data = b"".join(
+            self._read(s, e)
+            for s, e in zip(self._starts[start:end], self._ends[start:end])
+        )
+
+        return self._to_frame(frame, self._parse(data))
+
+    def __iter__(self) -> Iterator[MOTFrame]:
+        """Iterate over all frames with objects, in ascending order."""
+
+        self._ensure_index()
+
+        unique, first = np.unique(self._frames, return_index=True)
+        last = np.append(first[1:], len(self._frames))
+
+        ind = 0
+        while ind < len(unique):
+            # Frame split over several places in the file, read it separately
+            if last[ind] - first[ind] > 1:
+                yield self[int(unique[ind])]
+                ind += 1
+                continue
+
+            # Group together frames that directly follow each other in the file,
+            # so that they can be read and parsed at once
+            start = self._starts[first[ind]]
+            end_ind = ind + 1
+            while (
+                end_ind < len(unique)
+                and last[end_ind] - first[end_ind] == 1
+                and self._starts[first[end_ind]] == self._ends[first[end_ind - 1]]
+                and self._ends[first[end_ind]] - start <= self.chunk_size
+            ):
+                end_ind += 1
+
+            rows = self._parse(self._read(start, self._ends[first[end_ind - 1]]))
+            split_inds = np.flatnonzero(np.diff(rows[:, _FRAME_COL])) + 1
+            for frame, frame_rows in zip(
+                unique[ind:end_ind], np.split(rows, split_inds)
+            ):
+                yield self._to_frame(int(frame), frame_rows)
+
+            ind = end_ind
+
+    def _to_frame(self, frame: int, rows: np.ndarray) -> MOTFrame:
+        """Convert parsed rows into a :class:`MOTFrame`."""
+
+        xywh = rows[:, _BBOX_COLS]
+        bboxes = np.rint(np.concatenate((xywh[:, :2], xywh[:, :2] + xywh[:, 2:]), 1))
+
+        scores = None
+        if self._n_cols > _SCORE_COL:
+            scores = rows[:, _SCORE_COL]
+
+        return MOTFrame(
+            frame=frame,
+            bboxes=bboxes.astype(int),
+            ids=rows[:, _ID_COL].astype(int),
+            scores=scores,
+        )
+
+    def _parse(self, data: bytes) -> np.ndarray:
+        """Parse a block of complete lines into a float array."""
+
+        n_cols = max(self._n_cols, _SCORE_COL + 1)
+        lines = _split_lines(data)
+        if not lines:
+            return np.zeros((0, n_cols))
+
+        return np.loadtxt(
+            lines,
+            delimiter=",",
+            usecols=range(min(self._n_cols, _SCORE_COL + 1)),
+            ndmin=2,
+        )
+
+    def _read(self, start: int, end: int) -> bytes:
+        if self._file is None:
+            self._file = open(self.file_name, "rb")
+
+        self._file.seek(start)
+        return self._file.read(end - start)
+
+    def _ensure_index(self):
+        if self._indexed:
+            return
+
+        stat = self.file_name.stat()
+        if not (self.save_index and self._load_index(stat.st_size, stat.st_mtime_ns)):
+            self._build_index()
+            if self.save_index:
+                self._save_index(stat.st_size, stat.st_mtime_ns)
+
+        self._indexed = True
+
+    def _save_index(self, size: int, mtime: int):
+        """Save the index to disk, if possible.
+
+        Saving may fail, for example if the file is on a read-only file system -
+        the index is then only kept in memory. The index is written to a temporary
+        file which then replaces the old one, so that other readers never see a
+        partially written index.
+        """
+
+        tmp_name = None
+        try:
+            fd, tmp_name = tempfile.mkstemp(
+                prefix=self.index_file_name.name,
+                suffix=".tmp",
+                dir=self.index_file_name.parent,
+            )
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    frames=self._frames,
+                    starts=self._starts,
+                    ends=self._ends,
+                    n_cols=self._n_cols,
+                    size=size,
+                    mtime=mtime,
+                )
+            os.replace(tmp_name, self.index_file_name)
+        except OSError:
+            if tmp_name is not None:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_name)
+
+    def _load_index(self, size: int, mtime: int) -> bool:
+        """Load the index from disk, return ``False`` if it is missing or stale.
+
+        An index that can not be read (for example, a truncated file) is treated
+        the same as a stale one, so that it gets rebuilt.
+        """
+
+        if not self.index_file_name.exists():
+            return False
+
+        try:
+            with np.load(self.index_file_name) as index:
+                if index["size"] != size or index["mtime"] != mtime:
+                    return False
+
+                frames, starts, ends = index["frames"], index["starts"], index["ends"]
+                n_cols = int(index["n_cols"])
+        except (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile):
+            return False
+
+        self._frames, self._starts, self._ends = frames, starts, ends
+        self._n_cols = n_cols
+        return True
+
+    def _build_index(self):
+        """Scan the file and record byte ranges of consecutive lines of each frame."""
+
+        frames: List[np.ndarray] = []
+        starts: List[np.ndarray] = []
+        ends: List[np.ndarray] = []
+
+        with open(self.file_name, "rb") as f:
+            offset, rest = 0, b""
+            while True:
+                data = f.read(self.chunk_size)
+                block = rest + data
+                if data:
+                    # Only index complete lines, keep the rest for the next chunk
+                    cut = block.rfind(b"\n") + 1
+                    block, rest = block[:cut], block[cut:]
+
+                if block:
+                    block_runs = self._index_block(block, offset)
+                    for lst, arr in zip((frames, starts, ends), block_runs):
+                        lst.append(arr)
+                    offset += len(block)
+
+                if not data:
+                    break
+
+        if not frames:
+            return
+
+        all_frames = np.concatenate(frames)
+        all_starts, all_ends = np.concatenate(starts), np.concatenate(ends)
+
+        # Merge runs of the same frame split between chunks
+        new_run = np.ones(len(all_frames), dtype=bool)
+        new_run[1:] = (all_frames[1:] != all_frames[:-1]) | (
+            all_starts[1:] != all_ends[:-1]
+        )
+        run_inds = np.flatnonzero(new_run)
+        last_inds = np.append(run_inds[1:] - 1, len(all_frames) - 1)
+
+        order = np.argsort(all_frames[run_inds], kind="stable")
+        self._frames = all_frames[run_inds][order]
+        self._starts = all_starts[run_inds][order]
+        self._ends = all_ends[last_inds][order]
+
+    def _index_block(self, block: bytes, offset: int):
+        """Get frames and byte ranges of runs of lines in a block of complete lines."""
+
+        buf = np.frombuffer(block, dtype=np.uint8)
+        line_ends = np.flatnonzero(buf == _NEWLINE) + 1
+        if len(line_ends) == 0 or line_ends[-1] != len(buf):
+            line_ends = np.append(line_ends, len(buf))
+        line_starts = np.concatenate(([0], line_ends[:-1]))
+
+        # Skip empty lines, the same as the parser does
+        non_empty = self._non_empty_lines(buf, line_starts, line_ends)
+        line_starts, line_ends = line_starts[non_empty], line_ends[non_empty]
+
+        empty = np.zeros(0, dtype=np.int64)
+        if len(line_starts) == 0:
+            return empty, empty, empty
+
+        if not self._n_cols:
+            first_start, first_end = line_starts[0], line_ends[0]
+            self._n_cols = buf[first_start:first_end].tobytes().count(b",") + 1
+            if self._n_cols < _BBOX_COLS.stop:
+                raise ValueError(
+                    f"The file `{self.file_name}` has {self._n_cols} columns, but"
+                    f" at least {_BBOX_COLS.stop} are needed for the MOT format."
+                )
+
+        frames = np.loadtxt(
+            _split_lines(block), delimiter=",", usecols=_FRAME_COL, ndmin=1
+        ).astype(np.int64)
+
+        # Group consecutive lines with the same frame into runs
+        run_inds = np.flatnonzero(np.diff(frames, prepend=frames[0] - 1))
+        last_inds = np.append(run_inds[1:] - 1, len(frames) - 1)
+
+        return (
+            frames[run_inds],
+            line_starts[run_inds] + offset,
+            line_ends[last_inds] + offset,
+        )
+
+    @staticmethod
+    def _non_empty_lines(
+        buf: np.ndarray, line_starts: np.ndarray, line_ends: np.ndarray
+    ) -> np.ndarray:
+        """Get the mask of lines that contain something other than whitespace."""
+
+        is_space = np.isin(buf, np.frombuffer(_WHITESPACE, dtype=np.uint8))
+        n_space = np.concatenate(([0], np.cumsum(is_space)))
+        return (n_space[line_ends] - n_space[line_starts]) < (line_ends - line_starts)
+
+
+def _split_lines(data: bytes) -> List[bytes]:
+    """Split the data into lines, leaving out lines with only whitespace.
+
+    ``np.loadtxt`` skips empty lines, but fails on lines with only spaces or tabs.
+    """
+
+    return [line for line in data.split(b"\n") if line.strip(_WHITESPACE)]